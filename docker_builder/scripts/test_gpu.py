@@ -4,9 +4,55 @@ GPU test script for multi-simulator environment
 Tests GPU availability and compute capability for each simulator
 """
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+# Upper bound on threads used to query device properties
+_MAX_PROBE_WORKERS = 16
+
+# Memoized result of _probe_cuda(), shared by all tests in this process
+_CUDA_RESULT = None
+
+
+def _probe_cuda() -> Dict[str, Any]:
+    """Query CUDA devices once per process; later calls return the cached result"""
+    global _CUDA_RESULT
+    if _CUDA_RESULT is not None:
+        return _CUDA_RESULT
+
+    import torch
+
+    result = {
+        "available": torch.cuda.is_available(),
+        "device_count": 0,
+        "devices": []
+    }
+
+    if result["available"]:
+        torch.cuda.init()
+        result["device_count"] = torch.cuda.device_count()
+        # One driver query per device: name, capability and memory all come
+        # from the same properties struct. Devices are queried concurrently,
+        # capped to stay clear of driver threading limits.
+        workers = max(1, min(result["device_count"], _MAX_PROBE_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            all_props = list(executor.map(
+                torch.cuda.get_device_properties, range(result["device_count"])
+            ))
+        for i, props in enumerate(all_props):
+            result["devices"].append({
+                "id": i,
+                "name": props.name,
+                "compute_capability": f"{props.major}.{props.minor}",
+                "sm": f"sm_{props.major}{props.minor}",
+                "memory_gb": props.total_memory / 1e9
+            })
+
+    _CUDA_RESULT = result
+    return result
+
 
 def test_cuda_availability() -> Dict[str, Any]:
     """Test basic CUDA availability"""
@@ -21,23 +67,11 @@ def test_cuda_availability() -> Dict[str, Any]:
     }
 
     try:
-        import torch
-        result["available"] = torch.cuda.is_available()
-        result["device_count"] = torch.cuda.device_count()
+        result = _probe_cuda()
 
         if result["available"]:
-            for i in range(result["device_count"]):
-                cap = torch.cuda.get_device_capability(i)
-                device_info = {
-                    "id": i,
-                    "name": torch.cuda.get_device_name(i),
-                    "compute_capability": f"{cap[0]}.{cap[1]}",
-                    "sm": f"sm_{cap[0]}{cap[1]}",
-                    "memory_gb": torch.cuda.get_device_properties(i).total_memory / 1e9
-                }
-                result["devices"].append(device_info)
-
-                print(f"\nGPU {i}:")
+            for device_info in result["devices"]:
+                print(f"\nGPU {device_info['id']}:")
                 print(f"  Name: {device_info['name']}")
                 print(f"  Compute Capability: {device_info['compute_capability']} ({device_info['sm']})")
                 print(f"  Memory: {device_info['memory_gb']:.2f} GB")
@@ -66,11 +100,11 @@ def test_isaac_gym():
 
         import torch
         print(f"PyTorch version: {torch.__version__}")
-        print(f"CUDA available: {torch.cuda.is_available()}")
+        cuda = _probe_cuda()
+        print(f"CUDA available: {cuda['available']}")
 
-        if torch.cuda.is_available():
-            cap = torch.cuda.get_device_capability(0)
-            print(f"Compute capability: {cap[0]}.{cap[1]}")
+        if cuda["available"]:
+            print(f"Compute capability: {cuda['devices'][0]['compute_capability']}")
 
         try:
             import isaacgym
@@ -98,11 +132,11 @@ def test_genesis():
 
         import torch
         print(f"PyTorch version: {torch.__version__}")
-        print(f"CUDA available: {torch.cuda.is_available()}")
+        cuda = _probe_cuda()
+        print(f"CUDA available: {cuda['available']}")
 
-        if torch.cuda.is_available():
-            cap = torch.cuda.get_device_capability(0)
-            print(f"Compute capability: {cap[0]}.{cap[1]}")
+        if cuda["available"]:
+            print(f"Compute capability: {cuda['devices'][0]['compute_capability']}")
 
         try:
             import genesis as gs
@@ -150,35 +184,56 @@ def test_mjx():
         return False
 
 
-def test_performance():
-    """Run basic GPU performance test"""
+def test_performance(size: int = 2048):
+    """Run basic GPU performance test on size x size matrices"""
     print("\n" + "=" * 60)
     print("GPU Performance Test")
     print("=" * 60)
 
     try:
         import torch
-        import time
 
-        if not torch.cuda.is_available():
+        cuda = _probe_cuda()
+        if not cuda["available"]:
             print("CUDA not available, skipping performance test")
             return
 
+        # Create the context on every visible device up front so that one-time
+        # driver/JIT initialization stays out of the timing window
+        for i in range(cuda["device_count"]):
+            torch.empty(1, device=f"cuda:{i}")
+            torch.cuda.synchronize(i)
+
         device = torch.device("cuda:0")
-        size = 8192
 
-        # Warmup
-        a = torch.randn(size, size, device=device)
-        b = torch.randn(size, size, device=device)
-        torch.mm(a, b)
+        # Matmul timing does not depend on the values, so skip random init
+        a = torch.empty((size, size), device=device)
+        b = torch.empty((size, size), device=device)
+        c = torch.empty_like(a)
+        # Warm up on a side stream, as required before graph capture
+        s = torch.cuda.Stream()
+        s.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(s):
+            for _ in range(3):
+                torch.mm(a, b, out=c)
+        torch.cuda.current_stream().wait_stream(s)
         torch.cuda.synchronize()
 
-        # Benchmark
-        start = time.time()
-        for _ in range(10):
-            c = torch.mm(a, b)
+        # Capture the 10 matmuls in a CUDA graph so the timed region has no
+        # Python/launch overhead
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            for _ in range(10):
+                torch.mm(a, b, out=c)
+
+        # Benchmark, timed on the GPU with CUDA events
+        start = torch.cuda.Event(enable_timing=True)
+        end = torch.cuda.Event(enable_timing=True)
+        start.record()
+        graph.replay()
+        end.record()
         torch.cuda.synchronize()
-        elapsed = time.time() - start
+        elapsed = start.elapsed_time(end) / 1000.0
 
         flops = 2 * size**3 * 10  # matrix multiply FLOPS
         tflops = flops / elapsed / 1e12
@@ -187,6 +242,10 @@ def test_performance():
         print(f"  Time: {elapsed:.3f} seconds (10 iterations)")
         print(f"  Performance: {tflops:.2f} TFLOPS")
 
+        # Release the benchmark buffers held by the caching allocator
+        del a, b, c, graph
+        torch.cuda.empty_cache()
+
         print("\n✓ Performance test completed")
 
     except Exception as e:
@@ -195,6 +254,15 @@ def test_performance():
 
 def main():
     """Run all tests"""
+    parser = argparse.ArgumentParser(description="Multi-simulator GPU environment test")
+    parser.add_argument(
+        "--perf-size",
+        type=int,
+        default=2048,
+        help="Matrix size used by the matmul performance test (default: 2048)",
+    )
+    args = parser.parse_args()
+
     print("\n" + "=" * 60)
     print("Multi-Simulator GPU Environment Test")
     print("=" * 60)
@@ -226,7 +294,7 @@ def main():
     print("  run-mjx /workspace/scripts/test_gpu.py")
 
     # Run performance test
-    test_performance()
+    test_performance(args.perf_size)
 
     print("\n" + "=" * 60)
     print("Test Summary")
@@ -10,12 +10,11 @@ class BinaryDistribution(Distribution):
     def has_ext_modules(self):
         return True
 
-def collect_files(target_dir):
-    file_list = []
-    for (root, dirs, files) in os.walk(target_dir,followlinks=True):
-        for filename in files:
-            file_list.append(os.path.join('..', root, filename))
-    return file_list
+def bindings_patterns(platform_dir):
+    # Let setuptools glob the bindings instead of walking the tree ourselves.
+    # "**" only recurses in package_data since setuptools 62.3 (pyproject.toml);
+    # glob's "**" also descends into symlinked directories, as os.walk did.
+    return ["_bindings/%s/**/*" % platform_dir]
 
 def _do_setup():
     root_dir = os.path.dirname(os.path.realpath(__file__))
@@ -29,9 +28,9 @@ def _do_setup():
 
     package_files = []
     if sys.platform.startswith("win"):
-        package_files = package_files + collect_files("isaacgym/_bindings/windows-x86_64")
+        package_files = package_files + bindings_patterns("windows-x86_64")
     elif sys.platform.startswith("linux"):
-        package_files = package_files + collect_files("isaacgym/_bindings/linux-x86_64")
+        package_files = package_files + bindings_patterns("linux-x86_64")
 
     setup(packages=packages,
           package_data={
@@ -33,6 +33,8 @@ Examples:
   %(prog)s                              Generate report with default settings
   %(prog)s -o report.html              Save to custom output path
   %(prog)s -r results_dir -t "My Tests" Use custom results dir and title
+  %(prog)s --no-compress                Skip the .gz/.br copies of the report
+  %(prog)s --force                      Regenerate even if no result changed
         """,
     )
     parser.add_argument(
@@ -50,13 +52,25 @@ Examples:
         default="Grasp Benchmark Comparison Report",
         help="Report title (default: 'Grasp Benchmark Comparison Report')"
     )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Do not write pre-compressed .gz/.br copies next to the report"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the report even if its inputs are unchanged"
+    )
 
     args = parser.parse_args()
 
     generate_html_report(
         output_path=args.output,
         results_dir=Path(args.results_dir),
-        title=args.title
+        title=args.title,
+        compress=not args.no_compress,
+        force=args.force
     )
 
 
@@ -15,12 +15,21 @@
 
 import genesis as gs
 import numpy as np
+import torch
 from absl import app, flags
 from test_output_utils import (
     ensure_output_directory,
     generate_video_path,
+    open_video_writer,
     save_test_result,
-    save_video,
+)
+from trajectory_utils import (
+    HOLD_START,
+    TEST_DURATION,
+    apply_shake,
+    build_qpos_schedule,
+    build_shake_noise,
+    phase_step,
 )
 
 _Obj = flags.DEFINE_string(
@@ -43,14 +52,44 @@ _Visual = flags.DEFINE_boolean(
     short_name="V",
 )
 
+# Print the step counter every this many steps
+PROGRESS_INTERVAL = 100
 
-def lerp(a, b, t):
-    return a + t * (b - a)
 
+def prewarm_cuda():
+    """Create the CUDA context on every device before Genesis needs it.
 
-def main(argv):
-    # Initialize Genesis
+    Context creation then happens at a known point up front instead of inside
+    the first hidden kernel launch of gs.init()/scene.build().
+    """
+    if not torch.cuda.is_available():
+        return
+    torch.cuda.init()
+    for i in range(torch.cuda.device_count()):
+        torch.empty(1, device=f"cuda:{i}")
+        torch.cuda.synchronize(i)
+
+
+# Set once init_genesis() has run in this process
+_genesis_ready = False
+
+
+def init_genesis():
+    """Prewarm CUDA and initialize Genesis, once per process.
+
+    Tests may run back to back in a batch worker of run_all_grasp_tests.py,
+    and gs.init() must only be called once.
+    """
+    global _genesis_ready
+    if _genesis_ready:
+        return
+    prewarm_cuda()
     gs.init()
+    _genesis_ready = True
+
+
+def main(argv):
+    init_genesis()
 
     sim_dt = _Dt.value  # Simulation timestep
     # Create scene with viewer
@@ -119,96 +158,95 @@ def main(argv):
 
     franka.set_dofs_position(init_qpos)
 
-    # Initialize recording
-    if _Record.value:
-        frames = []
-        recording_fps = 30
-
     # Initialize output and tracking
     output_dir = ensure_output_directory()
     video_path = generate_video_path(
         "genesis", _Obj.value, _Shake.value, _UseMJX.value, _Dt.value, output_dir
     )
+
+    # Initialize recording, frames are encoded as they are rendered. The video
+    # file is only opened with the first frame, so a run that renders none
+    # leaves no file behind.
+    recording_fps = 30
+    writer = None
+    n_frames = 0
     test_passed = True
     drop_time = None
 
     # Simulation loop
     task = "shaking-grasp" if _Shake.value else "slip-grasp"
     step_cnt = 0
-    current_qpos = init_qpos.copy()
-
-    while True:
-        step_cnt += 1
-        elapsed_time = step_cnt * sim_dt
-        print(f"Step: {step_cnt}", end="\r")
-
-        # Phase 1: Move from init to lift (steps 0-500)
-        if 0 <= elapsed_time < 1:
-            ctrl_arm = lerp(init_qpos[:7], lift_qpos[:7], elapsed_time)
-            current_qpos[:7] = ctrl_arm
-            current_qpos[7:] = init_qpos[7:]  # Keep gripper open
-            franka.control_dofs_position(current_qpos)
-
-        # Phase 2: Move from lift to grasp (steps 500-1000)
-        elif 1 <= elapsed_time < 2:
-            ctrl_arm = lerp(lift_qpos[:7], grasp_qpos[:7], (elapsed_time - 1))
-            current_qpos[:7] = ctrl_arm
-            current_qpos[7:] = grasp_qpos[7:]  # Keep gripper at grasp position
-            franka.control_dofs_position(current_qpos)
-
-        # Phase 3: Close gripper (steps 1000-1500)
-        elif 2 <= elapsed_time < 3:
-            gripper_pos = lerp(0.04, 0.0, (elapsed_time - 2))
-            current_qpos[:7] = grasp_qpos[:7]  # Keep arm at grasp position
-            current_qpos[7] = gripper_pos
-            current_qpos[8] = gripper_pos
-            franka.control_dofs_position(current_qpos)
-
-        # Phase 4: Lift object (steps 1500-2000)
-        elif 3 <= elapsed_time < 4:
-            ctrl_arm = lerp(grasp_qpos[:7], lift_qpos[:7], (elapsed_time - 3))
-            current_qpos[:7] = ctrl_arm
-            current_qpos[7:] = lift_qpos[7:]  # Keep gripper closed
-            franka.control_dofs_position(current_qpos)
-
-        # Phase 5: Shake and verify (steps 2000-10000)
-        elif 4 <= elapsed_time < 20:
-            if _Shake.value and step_cnt % 2 == 0:
-                ctrl_arm = lift_qpos[:7] + np.random.normal(0, 0.025, size=7)
-                current_qpos[:7] = ctrl_arm
-                current_qpos[7:] = lift_qpos[7:]
-                franka.control_dofs_position(current_qpos)
-
-            # Check if object fell
-            obj_pos = obj.get_pos()
-            if obj_pos[2] < 0.03:
-                test_passed = False
-                drop_time = elapsed_time
-                print(f"❌ The {task}-{_Obj.value} failed.")
+    # Joint targets of the approach/grasp/lift phases, indexed by step
+    schedule = build_qpos_schedule(init_qpos, grasp_qpos, lift_qpos, sim_dt)
+    # Phase boundaries as step indices
+    hold_step = phase_step(HOLD_START, sim_dt)
+    end_step = phase_step(TEST_DURATION, sim_dt)
+    # The shake perturbations are part of the schedule as well; shake_updates
+    # marks the steps at which they pick a new arm target
+    shake_updates = np.zeros(len(schedule), dtype=bool)
+    if _Shake.value:
+        shake_updates = apply_shake(
+            schedule, build_shake_noise(len(schedule)), hold_step, end_step
+        )
+    # Steps between 50 Hz events: the drop check and the viewer refresh
+    interval_50hz = max(1, int(0.02 / sim_dt))
+    # Recording already renders through the camera, so the viewer is never
+    # refreshed while recording (the previous inline check only applied that
+    # to the modulo arm due to and/or precedence).
+    live_view = _Visual.value and not _Record.value
+
+    try:
+        while True:
+            step_cnt += 1
+            if step_cnt % PROGRESS_INTERVAL == 0:
+                print(f"Step: {step_cnt}", end="\r")
+
+            # Phase 1-4: Move to lift, move to grasp, close gripper, lift object
+            # (steps 0-2000)
+            if step_cnt < hold_step:
+                franka.control_dofs_position(schedule[step_cnt])
+
+            # Phase 5: Shake and verify (steps 2000-10000)
+            elif step_cnt < end_step:
+                if shake_updates[step_cnt]:
+                    franka.control_dofs_position(schedule[step_cnt])
+
+                # Check if object fell (at 50 Hz, each read syncs with the device)
+                if step_cnt % interval_50hz == 0:
+                    obj_pos = obj.get_pos()
+                    if obj_pos[2] < 0.03:
+                        test_passed = False
+                        drop_time = step_cnt * sim_dt
+                        print(f"❌ The {task}-{_Obj.value} failed.")
+                        break
+
+            # Phase 6: Success (step > 10000)
+            else:
+                print(f"✅ The {task}-{_Obj.value} passed.")
                 break
 
-        # Phase 6: Success (step > 10000)
-        elif elapsed_time >= 20:
-            print(f"✅ The {task}-{_Obj.value} passed.")
-            break
-
-        # Step simulation
-        interval = int(0.02 / sim_dt)  # render in 50 Hz
-        update_visualizer = (
-            interval == 0 or step_cnt % interval == 0 and not _Record.value
-        ) and _Visual.value
-        scene.step(
-            update_visualizer=update_visualizer, refresh_visualizer=update_visualizer
-        )
+            # Step simulation
+            update_visualizer = live_view and step_cnt % interval_50hz == 0
+            scene.step(
+                update_visualizer=update_visualizer,
+                refresh_visualizer=update_visualizer,
+            )
 
-        # Record frame if enabled
-        if _Record.value and len(frames) < int(scene.cur_t * recording_fps):
-            (rgb, _, _, _) = camera.render()
-            frames.append(rgb)
+            # Record frame if enabled
+            if _Record.value and n_frames < int(scene.cur_t * recording_fps):
+                (rgb, _, _, _) = camera.render()
+                if writer is None:
+                    writer = open_video_writer(
+                        video_path, fps=recording_fps, quality=8
+                    )
+                writer.append_data(rgb)
+                n_frames += 1
+    finally:
+        if writer is not None:
+            writer.close()
 
-    # Save recording if enabled
-    if _Record.value and len(frames) > 0:
-        save_video(frames, video_path, fps=recording_fps, quality=8)
+    # Save the result of the recording, if any frame was recorded
+    if n_frames > 0:
         save_test_result(
             video_path,
             "success" if test_passed else "failure",
@@ -13,7 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 
-from collections import deque
+import queue
+import threading
 
 import numpy as np
 from absl import app, flags
@@ -23,8 +24,16 @@ from motrixsim.render import CaptureTask, RenderApp
 from test_output_utils import (
     ensure_output_directory,
     generate_video_path,
+    open_video_writer,
     save_test_result,
-    save_video,
+)
+from trajectory_utils import (
+    HOLD_START,
+    TEST_DURATION,
+    apply_shake,
+    build_qpos_schedule,
+    build_shake_noise,
+    phase_step,
 )
 
 _Obj = flags.DEFINE_string(
@@ -48,10 +57,6 @@ _Visual = flags.DEFINE_boolean(
 )
 
 
-def lerp(a, b, t):
-    return a + t * (b - a)
-
-
 init_qpos = np.array([0.0, 0.0, 0.0, -1.5708, 0.0, 1.5708, -0.7853, 0.04, 0.04])
 grasp_qpos = np.array(
     [-1.0104, 1.5623, 1.3601, -1.6840, -1.5863, 1.7810, 1.4598, 0.04, 0.04]
@@ -60,6 +65,33 @@ lift_qpos = np.array(
     [-1.0426, 1.4028, 1.5634, -1.7114, -1.4055, 1.6015, 1.4510, 0.0, 0.0]
 )
 
+# Backoff (seconds) between polls of a pending capture; the last value repeats
+CAPTURE_POLL_DELAYS = (0.0001, 0.0002, 0.0005)
+
+
+def drain_captures(captures: queue.Queue, stop: threading.Event, writer) -> None:
+    """Append captured frames to the video as their capture completes.
+
+    Runs on a worker thread so that waiting for a capture never stalls the
+    physics loop. CaptureTask has no completion callback, so a pending capture
+    is polled with a short backoff; the waits return as soon as ``stop`` is
+    set, after which captures that are still pending are dropped. A ``None``
+    item ends the thread.
+    """
+    while True:
+        capture: CaptureTask = captures.get()
+        if capture is None:
+            return
+        polls = 0
+        while capture.state == "pending":
+            delay = CAPTURE_POLL_DELAYS[min(polls, len(CAPTURE_POLL_DELAYS) - 1)]
+            if stop.wait(delay):
+                return
+            polls += 1
+        img = capture.take_image()
+        if img is not None and img.pixels.max() > 0:
+            writer.append_data(img.pixels)
+
 
 # Mouse controls:
 # - Press and hold left button then drag to rotate the camera/view
@@ -83,8 +115,6 @@ def main(argv):
     cameras = model.cameras
     if _Record.value:
         cameras[0].set_render_target("image", 320, 240)
-        frames = []
-        capture_tasks = deque()
         capture_index = 0
     # Create the render instance of the model
     if renderer:
@@ -94,113 +124,122 @@ def main(argv):
     panda = model.get_body("link0")
     panda.set_dof_pos(data, init_qpos)
     obj = model.get_body(_Obj.value)
-    gripper_actuator = model.get_actuator("actuator8")
-
-    def set_arm_ctrl(target_qpos):
-        ctrls = data.actuator_ctrls
-        ctrls[:7] = target_qpos
-        data.actuator_ctrls = ctrls
-
-    def set_gripper_ctrl(target_gripper):
-        gripper_actuator.set_ctrl(data, target_gripper)
+    # Resolve actuator indices once; the per-step writes only reuse them
+    # (actuator1-7 drive the arm joints, actuator8 the gripper)
+    actuator_idx = np.array(
+        [model.get_actuator_index(f"actuator{i + 1}") for i in range(8)],
+        dtype=np.intp,
+    )
 
-    set_arm_ctrl(init_qpos[:7])
-    set_gripper_ctrl(init_qpos[7])
+    # Controls are staged in one persistent buffer and handed to the
+    # simulator with a single vector assignment, only on steps that change them.
+    # The buffer starts as a copy of the data's own controls, so it has their
+    # length and dtype.
+    ctrls = np.array(data.actuator_ctrls)
+    ctrls[actuator_idx] = init_qpos[:8]
+    data.actuator_ctrls = ctrls
 
-    task = "shaking-grasp" if _Shake.value else "slip-grasp"
+    shake = _Shake.value
+    task = "shaking-grasp" if shake else "slip-grasp"
     # Initialize output directory and video path
     output_dir = ensure_output_directory()
     video_path = generate_video_path(
         "motrix", _Obj.value, _Shake.value, _UseMJX.value, _Dt.value, output_dir
     )
-    drop_time = None  # Track when object drops
+    # Frames are encoded as their capture completes
+    writer = open_video_writer(video_path, fps=30, quality=8) if _Record.value else None
+    if _Record.value:
+        captures = queue.Queue()
+        stop_capture = threading.Event()
+        capture_thread = threading.Thread(
+            target=drain_captures, args=(captures, stop_capture, writer), daemon=True
+        )
+        capture_thread.start()
     step_cnt = 0
     sim_dt = _Dt.value  # Simulation timestep
     render_dt = 1.0 / 60.0  # Render at 30 Hz
     phys_steps_per_render = int(render_dt / sim_dt)
+    rcam = renderer.get_camera(0) if _Record.value else None
+    # Joint targets of the approach/grasp/lift phases, indexed by step
+    schedule = build_qpos_schedule(init_qpos, grasp_qpos, lift_qpos, sim_dt)
+    # Phase boundaries as step indices
+    hold_step = phase_step(HOLD_START, sim_dt)
+    end_step = phase_step(TEST_DURATION, sim_dt)
+    # The shake perturbations are part of the schedule as well; shake_updates
+    # marks the steps at which they pick a new arm target
+    shake_updates = np.zeros(len(schedule), dtype=bool)
+    if shake:
+        shake_updates = apply_shake(
+            schedule, build_shake_noise(len(schedule)), hold_step, end_step
+        )
+    check_interval = max(1, int(0.02 / sim_dt))
+
+    def finish(status, drop_time):
+        """Close the recording, save the test result and end the run."""
+        if _Record.value:
+            # Captures still pending at this point are dropped
+            stop_capture.set()
+            captures.put(None)
+            capture_thread.join()
+            writer.close()
+            save_test_result(
+                video_path,
+                status,
+                drop_time,
+                output_dir,
+                "motrix",
+                _Obj.value,
+                _Shake.value,
+                _UseMJX.value,
+                _Dt.value,
+            )
+        exit(0)
 
     while True:
-        for i in range(phys_steps_per_render):
-            step_cnt += 1
-            elapsed_time = step_cnt * sim_dt
-
-            # Phase 1: Move from init to lift (0-1 second)
-            if 0 <= elapsed_time < 1:
-                ctrl_arm = lerp(init_qpos[:7], lift_qpos[:7], elapsed_time)
-                set_arm_ctrl(ctrl_arm)
-            # Phase 2: Move from lift to grasp (1-2 seconds)
-            elif 1 <= elapsed_time < 2:
-                ctrl_arm = lerp(lift_qpos[:7], grasp_qpos[:7], (elapsed_time - 1))
-                set_arm_ctrl(ctrl_arm)
-            # Phase 3: Close gripper (2-3 seconds)
-            elif 2 <= elapsed_time < 3:
-                set_gripper_ctrl(lerp(0.04, 0, (elapsed_time - 2)))
-            # Phase 4: Lift object (3-4 seconds)
-            elif 3 <= elapsed_time < 4:
-                ctrl_arm = lerp(grasp_qpos[:7], lift_qpos[:7], (elapsed_time - 3))
-                set_arm_ctrl(ctrl_arm)
-            # Phase 5: Shake and verify (4-20 seconds)
-            elif 4 <= elapsed_time < 20:
-                if _Shake.value and step_cnt % 2 == 0:
-                    ctrl_arm = lift_qpos[:7] + np.random.normal(0, 0.025, size=7)
-                    set_arm_ctrl(ctrl_arm)
-                obj_pos = obj.get_pose(data)
-                if obj_pos[2] < 0.03:
-                    drop_time = elapsed_time
-                    print(f"❌ The {task}-{_Obj.value}-test failed.")
-                    if _Record.value:
-                        save_video(frames, video_path, fps=30, quality=8)
-                        save_test_result(
-                            video_path,
-                            "failure",
-                            drop_time,
-                            output_dir,
-                            "motrix",
-                            _Obj.value,
-                            _Shake.value,
-                            _UseMJX.value,
-                            _Dt.value,
-                        )
-                    exit(0)
-            # Phase 6: Success (>= 20 seconds)
-            elif elapsed_time >= 20:
-                print(f"✅ The {task}-{_Obj.value}-test passed.")
-                if _Record.value:
-                    save_video(frames, video_path, fps=30, quality=8)
-                    save_test_result(
-                        video_path,
-                        "success",
-                        None,
-                        output_dir,
-                        "motrix",
-                        _Obj.value,
-                        _Shake.value,
-                        _UseMJX.value,
-                        _Dt.value,
-                    )
-                exit(0)
-
-            # Physics world step
-            step(model, data)
+        # motrixsim only exposes single-step stepping. Without shaking nothing
+        # touches the controls during the hold phase, so such frames run their
+        # steps back to back with a single drop check at the end of the frame.
+        if (
+            not shake
+            and step_cnt + 1 >= hold_step
+            and step_cnt + phys_steps_per_render < end_step
+        ):
+            for _ in range(phys_steps_per_render):
+                step(model, data)
+            step_cnt += phys_steps_per_render
+            if obj.get_pose(data)[2] < 0.03:
+                print(f"❌ The {task}-{_Obj.value}-test failed.")
+                finish("failure", step_cnt * sim_dt)
+        else:
+            for i in range(phys_steps_per_render):
+                step_cnt += 1
+
+                # Phase 1-4: Move to lift, move to grasp, close gripper, lift object
+                if step_cnt < hold_step:
+                    ctrls[actuator_idx] = schedule[step_cnt, :8]
+                    data.actuator_ctrls = ctrls
+                # Phase 5: Shake and verify (4-20 seconds)
+                elif step_cnt < end_step:
+                    if shake_updates[step_cnt]:
+                        ctrls[actuator_idx] = schedule[step_cnt, :8]
+                        data.actuator_ctrls = ctrls
+                    # Check if object fell (at 50 Hz)
+                    if step_cnt % check_interval == 0 and obj.get_pose(data)[2] < 0.03:
+                        print(f"❌ The {task}-{_Obj.value}-test failed.")
+                        finish("failure", step_cnt * sim_dt)
+                # Phase 6: Success (>= 20 seconds)
+                else:
+                    print(f"✅ The {task}-{_Obj.value}-test passed.")
+                    finish("success", None)
+
+                # Physics world step
+                step(model, data)
 
         if renderer:
             if _Record.value and capture_index < step_cnt * sim_dt * 30:
-                rcam = renderer.get_camera(0)
-                capture_tasks.append((capture_index, rcam.capture()))
+                captures.put(rcam.capture())
                 capture_index += 1
             renderer.sync(data)
-            if _Record.value:
-                while len(capture_tasks) > 0:
-                    task: CaptureTask
-                    idx, task = capture_tasks[0]
-                    if task.state != "pending":
-                        capture_tasks.popleft()
-                        img = task.take_image()
-                        # assert img is not None
-                        if img is not None and img.pixels.max() > 0:
-                            frames.append(img.pixels)
-                    else:
-                        break
 
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 
+import queue
+import threading
 import time
 
 import mujoco
@@ -25,6 +27,14 @@ from test_output_utils import (
     save_test_result,
     save_video,
 )
+from trajectory_utils import (
+    HOLD_START,
+    TEST_DURATION,
+    apply_shake,
+    build_qpos_schedule,
+    build_shake_noise,
+    phase_step,
+)
 
 _Obj = flags.DEFINE_string(
     "object", "cube", "object to grasp, Choices: [cube, ball, bottle]"
@@ -45,10 +55,11 @@ _Visual = flags.DEFINE_boolean(
     "whether to visualize the simulation in a window, Choices: [True, False]",
     short_name="V",
 )
-
-
-def lerp(a, b, t):
-    return a + t * (b - a)
+_Realtime = flags.DEFINE_boolean(
+    "realtime",
+    True,
+    "whether to pace the viewer to wall-clock time, Choices: [True, False]",
+)
 
 
 init_qpos = np.array([0.0, 0.0, 0.0, -1.5708, 0.0, 1.5708, -0.7853, 0.04, 0.04])
@@ -59,6 +70,31 @@ lift_qpos = np.array(
     [-1.0426, 1.4028, 1.5634, -1.7114, -1.4055, 1.6015, 1.4510, 0.0, 0.0]
 )
 
+# Size of the recorded video frames
+FRAME_HEIGHT, FRAME_WIDTH = 240, 320
+
+
+def render_frames(
+    model: mujoco.MjModel, snapshots: queue.Queue, frames: np.ndarray
+) -> None:
+    """Render recorded state snapshots into ``frames`` on a worker thread.
+
+    Each queue item is ``(index, qpos, qvel)``; a ``None`` item ends the
+    thread. The renderer is created here because its GL context belongs to the
+    thread that creates it.
+    """
+    renderer = mujoco.Renderer(model, height=frames.shape[1], width=frames.shape[2])
+    render_data = mujoco.MjData(model)
+    while True:
+        snapshot = snapshots.get()
+        if snapshot is None:
+            break
+        index, render_data.qpos[:], render_data.qvel[:] = snapshot
+        mujoco.mj_forward(model, render_data)
+        renderer.update_scene(render_data, 0)
+        renderer.render(out=frames[index])
+    renderer.close()
+
 
 def main(argv):
     prefix = _UseMJX.value and "mjx_" or ""
@@ -81,9 +117,18 @@ def main(argv):
     drop_time = None
 
     if _Record.value:
-        frames = []
-        renderer = mujoco.Renderer(model)
-        renderer.update_scene(data, 0)
+        # Frames are rendered straight into one preallocated buffer by a
+        # worker thread, from state snapshots taken by the physics loop
+        frames = np.empty(
+            (int(TEST_DURATION * 30) + 1, FRAME_HEIGHT, FRAME_WIDTH, 3),
+            dtype=np.uint8,
+        )
+        n_frames = 0
+        snapshots = queue.Queue(maxsize=4)
+        render_thread = threading.Thread(
+            target=render_frames, args=(model, snapshots, frames), daemon=True
+        )
+        render_thread.start()
 
     task = "shaking-grasp" if _Shake.value else "slip-grasp"
 
@@ -93,42 +138,55 @@ def main(argv):
         viewer = mujoco.viewer.launch_passive(model, data)
 
     step_cnt = 0
+    sim_dt = model.opt.timestep
+    # Joint targets of the approach/grasp/lift phases, indexed by step
+    schedule = build_qpos_schedule(init_qpos, grasp_qpos, lift_qpos, sim_dt)
+    # Phase boundaries as step indices
+    hold_step = phase_step(HOLD_START, sim_dt)
+    end_step = phase_step(TEST_DURATION, sim_dt)
+    check_interval = max(1, int(0.02 / sim_dt))
+    obj_body_id = model.body(_Obj.value).id
+    # The shake perturbations are part of the schedule as well; shake_updates
+    # marks the steps at which they pick a new arm target
+    shake_updates = np.zeros(len(schedule), dtype=bool)
+    if _Shake.value:
+        shake_updates = apply_shake(
+            schedule, build_shake_noise(len(schedule)), hold_step, end_step
+        )
+    # Actuator targets only, contiguous and in the dtype of data.ctrl, so each
+    # control write is a plain row copy
+    ctrl_schedule = np.ascontiguousarray(schedule[:, :8], dtype=data.ctrl.dtype)
+    # The viewer is refreshed at 60 Hz. When paced, the loop sleeps once per
+    # refresh until the wall clock catches up with the simulation time; record
+    # runs are never paced.
+    view_interval = max(1, int(1.0 / 60.0 / sim_dt))
+    realtime = _Realtime.value and not _Record.value
+    wall_start = time.time()
+
     while True:
         # Check if viewer is still running (only applicable if viewer exists)
         if viewer and not viewer.is_running():
             break
         step_cnt += 1
-        step_start = time.time()
-        elapsed_time = step_cnt * model.opt.timestep
-
-        # Phase 1: Move from init to lift (0-1 second)
-        if 0 <= elapsed_time < 1:
-            ctrl_arm = lerp(init_qpos[:7], lift_qpos[:7], elapsed_time)
-            data.ctrl[:7] = ctrl_arm
-        # Phase 2: Move from lift to grasp (1-2 seconds)
-        elif 1 <= elapsed_time < 2:
-            ctrl_arm = lerp(lift_qpos[:7], grasp_qpos[:7], (elapsed_time - 1))
-            data.ctrl[:7] = ctrl_arm
-        # Phase 3: Close gripper (2-3 seconds)
-        elif 2 <= elapsed_time < 3:
-            data.ctrl[7] = lerp(0.04, 0, (elapsed_time - 2))
-        # Phase 4: Lift object (3-4 seconds)
-        elif 3 <= elapsed_time < 4:
-            ctrl_arm = lerp(grasp_qpos[:7], lift_qpos[:7], (elapsed_time - 3))
-            data.ctrl[:7] = ctrl_arm
+
+        # Phase 1-4: Move to lift, move to grasp, close gripper, lift object
+        # (0-4 seconds)
+        if step_cnt < hold_step:
+            data.ctrl[:8] = ctrl_schedule[step_cnt]
         # Phase 5: Shake and verify (4-20 seconds)
-        elif 4 <= elapsed_time < 20:
-            if _Shake.value and step_cnt % 2 == 0:
-                ctrl_arm = lift_qpos[:7] + np.random.normal(0, 0.025, size=7)
-                data.ctrl[:7] = ctrl_arm
-            obj_pos = data.xpos[model.body(_Obj.value).id]
-            if obj_pos[2] < 0.04:
-                test_passed = False
-                drop_time = elapsed_time
-                print(f"❌ The {task}-{_Obj.value} failed.")
-                break
+        elif step_cnt < end_step:
+            if shake_updates[step_cnt]:
+                data.ctrl[:7] = ctrl_schedule[step_cnt, :7]
+            # Check if object fell (at 50 Hz)
+            if step_cnt % check_interval == 0:
+                obj_pos = data.xpos[obj_body_id]
+                if obj_pos[2] < 0.04:
+                    test_passed = False
+                    drop_time = step_cnt * sim_dt
+                    print(f"❌ The {task}-{_Obj.value} failed.")
+                    break
         # Phase 6: Success (>= 20 seconds)
-        elif elapsed_time >= 20:
+        else:
             print(f"✅ The {task}-{_Obj.value} passed.")
             break
 
@@ -137,24 +195,24 @@ def main(argv):
         mujoco.mj_step(model, data)
 
         # Sync viewer if present
-        if viewer:
+        if viewer and step_cnt % view_interval == 0:
             viewer.sync()
-            # Rudimentary time keeping, will drift relative to wall clock.
-            time_until_next_step = model.opt.timestep - (time.time() - step_start)
-            if time_until_next_step > 0:
-                time.sleep(time_until_next_step)
+            if realtime:
+                time.sleep(max(0.0, wall_start + data.time - time.time()))
 
         # Recording (works in both modes)
-        if _Record.value and len(frames) < data.time * 30:
-            renderer.update_scene(data, 0)
-            frames.append(renderer.render().copy())
+        if _Record.value and n_frames < data.time * 30:
+            snapshots.put((n_frames, data.qpos.copy(), data.qvel.copy()))
+            n_frames += 1
 
     # Clean up viewer context manager
     if viewer:
         viewer.close()
 
     if _Record.value:
-        save_video(frames, video_path, fps=30, quality=8)
+        snapshots.put(None)
+        render_thread.join()
+        save_video(frames[:n_frames], video_path, fps=30, quality=8)
         save_test_result(
             video_path,
             "success" if test_passed else "failure",
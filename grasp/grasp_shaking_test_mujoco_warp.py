@@ -22,6 +22,15 @@ from test_output_utils import (
     save_test_result,
     save_video,
 )
+from trajectory_utils import (
+    HOLD_START,
+    PHASE_TIMES,
+    TEST_DURATION,
+    apply_shake,
+    build_qpos_schedule,
+    build_shake_noise,
+    phase_step,
+)
 
 # Try to import mujoco_warp, provide helpful error if not available
 try:
@@ -49,18 +58,25 @@ _Dt = flags.DEFINE_float("dt", 0.002, "simulation timestep")
 _UseMJX = flags.DEFINE_boolean(
     "mjx", False, "Use mjx_panda.xml or panda.xml for the Franka robot model"
 )
+_NWorld = flags.DEFINE_integer(
+    "nworld",
+    1,
+    "number of replicas of the test simulated in one batch, each with its own "
+    "shake noise; the test passes only if every replica holds the object",
+)
 
 
-def lerp(a, b, t):
-    return a + t * (b - a)
-
-
-init_qpos = np.array([0.0, 0.0, 0.0, -1.5708, 0.0, 1.5708, -0.7853, 0.04, 0.04])
+# Waypoints are float32 like the device arrays, so uploads need no conversion
+init_qpos = np.array(
+    [0.0, 0.0, 0.0, -1.5708, 0.0, 1.5708, -0.7853, 0.04, 0.04], dtype=np.float32
+)
 grasp_qpos = np.array(
-    [-1.0104, 1.5623, 1.3601, -1.6840, -1.5863, 1.7810, 1.4598, 0.04, 0.04]
+    [-1.0104, 1.5623, 1.3601, -1.6840, -1.5863, 1.7810, 1.4598, 0.04, 0.04],
+    dtype=np.float32,
 )
 lift_qpos = np.array(
-    [-1.0426, 1.4028, 1.5634, -1.7114, -1.4055, 1.6015, 1.4510, 0.0, 0.0]
+    [-1.0426, 1.4028, 1.5634, -1.7114, -1.4055, 1.6015, 1.4510, 0.0, 0.0],
+    dtype=np.float32,
 )
 
 
@@ -74,30 +90,33 @@ def main(argv):
 
     # Put model and data on GPU device using MuJoCo-Warp
     # Note: mjw.make_data creates data with batch dimension (nworld, ...)
+    nworld = _NWorld.value
     m = mjw.put_model(mjm)
-    d = mjw.make_data(mjm)
+    d = mjw.make_data(mjm, nworld=nworld)
 
-    # Initialize state - ctrl has shape (1, 8) where 1 is nworld, 8 is nu
-    # qpos has shape (1, nq) where nq is 16 (includes object free joint)
+    # Initialize state - ctrl has shape (nworld, 8), 8 is nu
+    # qpos has shape (nworld, nq) where nq is 16 (includes object free joint)
     # We only set the first 9 elements, the rest are object DOFs
-    ctrl_array = np.zeros((1, 8), dtype=np.float32)
-    ctrl_array[0, :7] = init_qpos[:7]
-    ctrl_array[0, 7] = init_qpos[7]
-    wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
+    wp.copy(d.ctrl, wp.array(np.tile(init_qpos[:8], (nworld, 1)), dtype=wp.float32))
 
     # Initialize qpos - set first 9 elements, keep rest at default (object position)
-    qpos_init = d.qpos.numpy()[0]
-    qpos_init[:9] = init_qpos
+    qpos_init = d.qpos.numpy()
+    qpos_init[:, :9] = init_qpos
     # The rest of qpos (elements 9-15) contain the cube's free joint DOF
     # Leave them at default values from the model
-    wp.copy(d.qpos, wp.array(qpos_init.reshape(1, -1), dtype=wp.float32))
+    wp.copy(d.qpos, wp.array(qpos_init, dtype=wp.float32))
 
     if _Record.value:
-        frames = []
         renderer = mujoco.Renderer(mjm)
+        # Frames are rendered straight into one preallocated buffer
+        frames = np.empty(
+            (int(TEST_DURATION * 30) + 1, renderer.height, renderer.width, 3),
+            dtype=np.uint8,
+        )
+        n_frames = 0
         # Get initial CPU data for rendering
         mjd_cpu = mujoco.MjData(mjm)
-        mjd_cpu.qpos[:] = qpos_init  # Use full qpos_init, not just init_qpos
+        mjd_cpu.qpos[:] = qpos_init[0]  # Use full qpos_init, not just init_qpos
         mujoco.mj_forward(mjm, mjd_cpu)
         renderer.update_scene(mjd_cpu, 0)
 
@@ -106,9 +125,6 @@ def main(argv):
     video_path = generate_video_path(
         "mujocowarp", _Obj.value, _Shake.value, _UseMJX.value, _Dt.value, output_dir
     )
-    test_passed = True
-    drop_time = None
-
     task = "shaking-grasp" if _Shake.value else "slip-grasp"
 
     # Get object body index for final verification
@@ -116,73 +132,139 @@ def main(argv):
 
     # Simulation loop
     step_cnt = 0
-    # Track current gripper state
-    current_gripper = init_qpos[7]
+    sim_dt = mjm.opt.timestep
+    # Joint targets of the approach/grasp/lift phases, indexed by step
+    schedule = build_qpos_schedule(init_qpos, grasp_qpos, lift_qpos, sim_dt)
+    # Phase boundaries as step indices
+    hold_step = phase_step(HOLD_START, sim_dt)
+    end_step = phase_step(TEST_DURATION, sim_dt)
+    # One (nworld, nu) block per step, laid out like d.ctrl
+    world_schedule = np.repeat(schedule[:, None, :8], nworld, axis=1)
+    # The shake perturbations are part of the schedule as well, drawn per
+    # world; shake_updates marks the steps at which they pick a new arm target
+    shake_updates = np.zeros(len(schedule), dtype=bool)
+    if _Shake.value:
+        for w in range(nworld):
+            shake_updates = apply_shake(
+                world_schedule[:, w],
+                build_shake_noise(len(schedule)),
+                hold_step,
+                end_step,
+            )
+    # The whole control schedule is uploaded once; each step only issues a
+    # device-to-device copy of its (nworld, nu) block into d.ctrl. With a
+    # single world, steps that move only the gripper or only the arm copy
+    # just those columns.
+    ctrl_dev = wp.array(world_schedule, dtype=wp.float32, device=d.ctrl.device)
+    nu = ctrl_dev.shape[2]
+    block = nworld * nu
+    close_start = phase_step(PHASE_TIMES[2], sim_dt)
+    close_end = phase_step(PHASE_TIMES[3], sim_dt)
+    single = nworld == 1
+    arm_count = 7 if single else block
+
+    # Physics runs on the device's current stream. Object positions are read
+    # back on a side stream, ordered with events, so the drop check stalls
+    # neither the host nor the physics step.
+    compute_stream = wp.get_stream(d.ctrl.device)
+    readback_stream = wp.Stream(d.ctrl.device)
+    xpos_host = wp.empty(
+        shape=d.xpos.shape, dtype=d.xpos.dtype, device="cpu", pinned=True
+    )
+    # (step, event) of the readback in flight, evaluated at the next check
+    pending_check = None
+
+    # Time at which each world dropped its object, NaN while it is held
+    drop_times = np.full(nworld, np.nan)
+
+    def check_drops():
+        """Evaluate the last object positions read back from the device.
+
+        Returns:
+            True once every world has dropped its object
+        """
+        if pending_check is None:
+            return False
+        wp.synchronize_event(pending_check[1])
+        dropped = xpos_host.numpy()[:, obj_body_id, 2] < 0.04
+        drop_times[dropped & np.isnan(drop_times)] = pending_check[0] * sim_dt
+        return not np.isnan(drop_times).any()
 
     while True:
         step_cnt += 1
-        elapsed_time = step_cnt * mjm.opt.timestep
-
-        # Phase 1: Move from init to lift (0-1 second)
-        if 0 <= elapsed_time < 1:
-            ctrl_arm = lerp(init_qpos[:7], lift_qpos[:7], elapsed_time)
-            ctrl_array[0, :7] = ctrl_arm
-            ctrl_array[0, 7] = current_gripper
-            wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
-        # Phase 2: Move from lift to grasp (1-2 seconds)
-        elif 1 <= elapsed_time < 2:
-            ctrl_arm = lerp(lift_qpos[:7], grasp_qpos[:7], (elapsed_time - 1))
-            ctrl_array[0, :7] = ctrl_arm
-            ctrl_array[0, 7] = current_gripper
-            wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
-        # Phase 3: Close gripper (2-3 seconds)
-        elif 2 <= elapsed_time < 3:
-            current_gripper = lerp(0.04, 0.0, (elapsed_time - 2))
-            ctrl_array[0, :7] = grasp_qpos[:7]
-            ctrl_array[0, 7] = current_gripper
-            wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
-        # Phase 4: Lift object (3-4 seconds)
-        elif 3 <= elapsed_time < 4:
-            ctrl_arm = lerp(grasp_qpos[:7], lift_qpos[:7], (elapsed_time - 3))
-            ctrl_array[0, :7] = ctrl_arm
-            ctrl_array[0, 7] = current_gripper
-            wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
+        row = step_cnt * block
+
+        # Phase 1-4: Move to lift, move to grasp, close gripper, lift object
+        # (0-4 seconds)
+        if step_cnt < hold_step:
+            if single and close_start < step_cnt < close_end:
+                # Only the gripper moves while it closes
+                wp.copy(
+                    d.ctrl,
+                    ctrl_dev,
+                    dest_offset=7,
+                    src_offset=row + 7,
+                    count=1,
+                    stream=compute_stream,
+                )
+            else:
+                wp.copy(
+                    d.ctrl, ctrl_dev, src_offset=row, count=block, stream=compute_stream
+                )
         # Phase 5: Shake and verify (4-20 seconds)
-        elif 4 <= elapsed_time < 20:
-            if _Shake.value and step_cnt % 2 == 0:
-                ctrl_arm = lift_qpos[:7] + np.random.normal(0, 0.025, size=7)
-                ctrl_array[0, :7] = ctrl_arm
-                ctrl_array[0, 7] = current_gripper
-                wp.copy(d.ctrl, wp.array(ctrl_array, dtype=wp.float32))
-            # Check if object fell - copy final state to CPU MuJoCo and verify
-            # We do this check periodically during the shake phase
-            if step_cnt % 100 == 0:  # Check every 0.2 seconds
-                obj_pos = d.xpos.numpy()[0, obj_body_id]
-                if obj_pos[2] < 0.04:
-                    test_passed = False
-                    drop_time = elapsed_time
-                    print(f"❌ The {task}-{_Obj.value} failed.")
+        elif step_cnt < end_step:
+            if shake_updates[step_cnt]:
+                # Shaking only perturbs the arm joints
+                wp.copy(
+                    d.ctrl,
+                    ctrl_dev,
+                    src_offset=row,
+                    count=arm_count,
+                    stream=compute_stream,
+                )
+            # Check if object fell. The position is read back asynchronously
+            # every 0.2 seconds and evaluated at the following check, by which
+            # time the copy has long completed.
+            if step_cnt % 100 == 0:
+                if check_drops():
                     break
-        # Phase 6: Success (>= 20 seconds)
-        elif elapsed_time >= 20:
-            print(f"✅ The {task}-{_Obj.value} passed.")
+                readback_stream.wait_event(compute_stream.record_event())
+                wp.copy(xpos_host, d.xpos, stream=readback_stream)
+                readback_done = readback_stream.record_event()
+                # Keep the next step from overwriting xpos mid-copy
+                compute_stream.wait_event(readback_done)
+                pending_check = (step_cnt, readback_done)
+        # Phase 6: Success (>= 20 seconds), unless the last readback shows a drop
+        else:
+            check_drops()
             break
 
         # Step physics using MuJoCo-Warp
         mjw.step(m, d)
 
         # Record frame if enabled
-        if _Record.value and len(frames) < int(elapsed_time * 30):
+        if _Record.value and n_frames < int(step_cnt * sim_dt * 30):
             # Copy GPU data to CPU for rendering
             mjd_cpu.qpos[:] = d.qpos.numpy()[0]
             mjd_cpu.qvel[:] = d.qvel.numpy()[0]
             mujoco.mj_forward(mjm, mjd_cpu)
             renderer.update_scene(mjd_cpu, 0)
-            frames.append(renderer.render().copy())
+            renderer.render(out=frames[n_frames])
+            n_frames += 1
+
+    n_dropped = int(np.count_nonzero(~np.isnan(drop_times)))
+    test_passed = n_dropped == 0
+    drop_time = None if test_passed else float(np.nanmin(drop_times))
+    if test_passed:
+        print(f"✅ The {task}-{_Obj.value} passed.")
+    else:
+        print(f"❌ The {task}-{_Obj.value} failed.")
+    if nworld > 1:
+        print(f"{nworld - n_dropped}/{nworld} worlds held the object")
 
-    # Save recording if enabled
+    # Save recording if enabled (world 0 is rendered)
     if _Record.value:
-        save_video(frames, video_path, fps=30, quality=8)
+        save_video(frames[:n_frames], video_path, fps=30, quality=8)
         save_test_result(
             video_path,
             "success" if test_passed else "failure",
@@ -25,13 +25,28 @@ Example usage:
 
     # Run specific engines and objects
     python grasp/run_all_grasp_tests.py --engines mujoco,motrix --objects cube,bottle
+
+By default every test runs in its own subprocess. With --batch, the tests of
+each engine run in one batch subprocess that imports the test script once and
+runs its tests back to back; a test that hangs or crashes that process then
+also fails the tests of the engine that have not reported yet.
 """
 
 import argparse
+import contextlib
+import functools
+import importlib
+import io
+import json
+import os
+import re
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 
 # Test configuration for each engine
 TEST_CONFIGS = [
@@ -62,6 +77,24 @@ DEFAULT_ENGINES = [cfg["engine"] for cfg in TEST_CONFIGS]
 DEFAULT_OBJECTS = ["ball", "cube", "bottle"]
 DEFAULT_DT_VALUES = [0.002, 0.01]
 
+_ENGINE_MAP = {cfg["engine"]: cfg for cfg in TEST_CONFIGS}
+_VALID_ENGINES = frozenset(_ENGINE_MAP)
+_VALID_OBJECTS = frozenset(DEFAULT_OBJECTS)
+
+# Timeout per test in seconds (some tests may hang)
+TEST_TIMEOUT = 60
+# Bytes of output kept from a single test run when not verbose
+OUTPUT_TAIL_BYTES = 4096
+# Prefix of the result lines a batch worker writes to stdout
+BATCH_RESULT_PREFIX = "GRASP_TEST_RESULT "
+
+# Outcome of one test: (success, output, status), status being one of
+# PASSED, FAILED, TIMEOUT or SKIPPED
+Outcome = Tuple[bool, str, str]
+
+_PASSED_RE = re.compile("passed", re.IGNORECASE)
+_FAILED_RE = re.compile("failed", re.IGNORECASE)
+
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -75,6 +108,9 @@ Examples:
   %(prog)s --objects cube,bottle        Run specific objects
   %(prog)s --dt-values 0.002            Run specific dt values
   %(prog)s --no-report                  Skip report generation
+  %(prog)s --parallel 4                 Run 4 tests at a time
+  %(prog)s --batch                      Run each engine's tests in one process
+  %(prog)s --fail-fast 2                Skip an engine after 2 failures in a row
         """,
     )
     parser.add_argument(
@@ -119,8 +155,34 @@ Examples:
     )
     parser.add_argument(
         "--parallel",
+        type=int,
+        nargs="?",
+        const=os.cpu_count() or 1,
+        default=0,
+        metavar="N",
+        help="Run up to N tests in parallel (default N: CPU count; experimental, "
+        "may cause issues)",
+    )
+    parser.add_argument(
+        "--batch",
         action="store_true",
-        help="Run tests in parallel (experimental, may cause issues)",
+        help="Run the tests of each engine in one subprocess instead of one per "
+        "test (faster startup; a hung or crashed test fails the rest of the batch)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Skip the remaining tests of an engine after N consecutive failures "
+        "(default: 0, disabled; best-effort with --parallel, where tests already "
+        "running are not stopped)",
+    )
+    parser.add_argument(
+        "--batch-worker",
+        type=str,
+        default=None,
+        help=argparse.SUPPRESS,
     )
     parser.add_argument(
         "-v",
@@ -134,63 +196,318 @@ Examples:
 
 def get_engine_config(engine_name: str) -> Dict:
     """Get configuration for a specific engine."""
-    for config in TEST_CONFIGS:
-        if config["engine"] == engine_name:
-            return config
-    raise ValueError(f"Unknown engine: {engine_name}")
+    try:
+        return _ENGINE_MAP[engine_name]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {engine_name}") from None
+
+
+def test_key(engine: str, object_name: str, dt: float) -> str:
+    """Return the key identifying a test in the results."""
+    return f"{engine}_{object_name}_dt{dt:.3f}"
+
+
+def build_test_args(object_name: str, dt: float, shake: bool) -> List[str]:
+    """Build the command line flags of a test script run."""
+    args = [
+        f"--object={object_name}",
+        f"--dt={dt}",
+        "--mjx",
+        "--record",  # Always record to generate output for report
+    ]
+
+    if shake:
+        args.append("--shake")
+    return args
+
+
+def is_test_success(output: str, completed: bool) -> bool:
+    """Check a test's output for success indicators.
+
+    A test passes if it reports "passed", or if it completed normally without
+    reporting "failed". The case-insensitive search runs on the output as is,
+    without building a lowercased copy of it.
+    """
+    return bool(_PASSED_RE.search(output)) or (
+        completed and not _FAILED_RE.search(output)
+    )
+
+
+def skipped_outcome(fail_fast: int) -> Outcome:
+    """Return the outcome of a test skipped by --fail-fast."""
+    return (
+        False,
+        f"[SKIPPED] Engine failed {fail_fast} consecutive tests",
+        "SKIPPED",
+    )
+
+
+def echo_line(line: str) -> None:
+    """Print a line of live test output (verbose mode)."""
+    print(f"    {line}", end="", flush=True)
+
+
+def run_command(
+    cmd: List[str],
+    timeout: float,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> Tuple[Optional[int], str]:
+    """Run a command and collect its combined stdout/stderr as it is produced.
+
+    Output is read line by line on a reader thread, so the child never blocks
+    on a full pipe and ``on_line`` sees every line as soon as it is written.
+
+    Args:
+        cmd: Command to run
+        timeout: Seconds after which the command is killed
+        on_line: Optional callback for each output line
+
+    Returns:
+        (returncode, output), where returncode is None if the command timed out
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    lines = []
+
+    def read_output():
+        for line in proc.stdout:
+            lines.append(line)
+            if on_line:
+                on_line(line)
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+    try:
+        returncode = proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        returncode = None
+    # Children of the test may still hold the pipe open, so do not wait forever
+    reader.join(timeout=5)
+    return returncode, "".join(lines)
+
+
+def run_command_tail(
+    cmd: List[str], timeout: float, tail_bytes: int = OUTPUT_TAIL_BYTES
+) -> Tuple[Optional[int], str]:
+    """Run a command and return only the end of its combined stdout/stderr.
+
+    The output is written to a temporary file instead of a pipe, so nothing is
+    buffered in this process while the command runs; only the last
+    ``tail_bytes`` are read back (starting at a line boundary when cut).
+
+    Args:
+        cmd: Command to run
+        timeout: Seconds after which the command is killed
+        tail_bytes: Number of trailing output bytes to return
+
+    Returns:
+        (returncode, output tail), where returncode is None if the command
+        timed out
+    """
+    with tempfile.TemporaryFile() as f:
+        proc = subprocess.Popen(cmd, stdout=f, stderr=subprocess.STDOUT)
+        try:
+            returncode = proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            returncode = None
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - tail_bytes))
+        tail = f.read()
+    if size > tail_bytes:
+        tail = tail[tail.find(b"\n") + 1 :]
+    return returncode, tail.decode(errors="replace")
 
 
 def run_single_test(
     engine: str, object_name: str, dt: float, shake: bool, verbose: bool = False
-) -> Tuple[bool, str]:
-    """Run a single test and return (success, output)."""
+) -> Outcome:
+    """Run a single test and return (success, output, status)."""
     config = get_engine_config(engine)
     script_path = Path(config["script"])
 
     if not script_path.exists():
-        return False, f"Script not found: {script_path}"
+        return False, f"Script not found: {script_path}", "FAILED"
 
     # Build command
+    cmd = [sys.executable, str(script_path)] + build_test_args(object_name, dt, shake)
+
+    if verbose:
+        print(f"  Running: {' '.join(cmd)}")
+
+    # Run test. The verdict is printed near the end of the output, so unless
+    # the output is echoed only its tail is kept.
+    try:
+        if verbose:
+            returncode, output = run_command(cmd, TEST_TIMEOUT, on_line=echo_line)
+        else:
+            returncode, output = run_command_tail(cmd, TEST_TIMEOUT)
+    except Exception as e:
+        return False, f"Error running test: {e}", "FAILED"
+
+    if returncode is None:
+        # Keep the partial output
+        output += f"\n[TIMEOUT] Test timed out after {TEST_TIMEOUT} seconds"
+        return False, output, "TIMEOUT"
+
+    # Check for success indicators in output
+    success = is_test_success(output, returncode == 0)
+    return success, output, "PASSED" if success else "FAILED"
+
+
+def run_engine_batch(
+    engine: str,
+    objects: List[str],
+    dt_values: List[float],
+    shake: bool,
+    verbose: bool = False,
+    fail_fast: int = 0,
+) -> Dict[str, Outcome]:
+    """Run all tests of one engine in a single batch subprocess.
+
+    The engine is imported once for the whole batch instead of once per test.
+    Tests that report no result (the worker crashed or timed out) are failed
+    with the worker's remaining output.
+
+    Returns:
+        Dict mapping test_key to (success, output, status)
+    """
+    config = get_engine_config(engine)
+    keys = [test_key(engine, obj, dt) for obj in objects for dt in dt_values]
+    script_path = Path(config["script"])
+
+    if not script_path.exists():
+        return {
+            key: (False, f"Script not found: {script_path}", "FAILED") for key in keys
+        }
+
     cmd = [
         sys.executable,
-        str(script_path),
-        f"--object={object_name}",
-        f"--dt={dt}",
-        "--mjx",
-        "--record",  # Always record to generate output for report
+        str(Path(__file__)),
+        f"--batch-worker={engine}",
+        f"--objects={','.join(objects)}",
+        f"--dt-values={','.join(str(dt) for dt in dt_values)}",
     ]
-
-    if shake:
-        cmd.append("--shake")
+    if not shake:
+        cmd.append("--no-shake")
+    if fail_fast:
+        cmd.append(f"--fail-fast={fail_fast}")
 
     if verbose:
         print(f"  Running: {' '.join(cmd)}")
 
-    # Run test
+    def echo_log_line(line: str) -> None:
+        if not line.startswith(BATCH_RESULT_PREFIX):
+            echo_line(line)
+
+    timeout = TEST_TIMEOUT * len(keys)
+    note = ""
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,  # 1 minute timeout per test (some tests may hang)
+        returncode, output = run_command(
+            cmd, timeout, on_line=echo_log_line if verbose else None
         )
+    except Exception as e:
+        return {key: (False, f"Error running test: {e}", "FAILED") for key in keys}
+    status = "FAILED"
+    if returncode is None:
+        status = "TIMEOUT"
+        note = f"\n[TIMEOUT] Test batch timed out after {timeout} seconds"
+
+    outcomes = {}
+    log = []
+    for line in output.splitlines():
+        if line.startswith(BATCH_RESULT_PREFIX):
+            record = json.loads(line[len(BATCH_RESULT_PREFIX) :])
+            key = test_key(engine, record["object"], record["dt"])
+            outcomes[key] = (record["success"], record["output"], record["status"])
+        else:
+            log.append(line)
+    for key in keys:
+        if key not in outcomes:
+            outcomes[key] = (False, "\n".join(log) + note, status)
+    return outcomes
+
+
+def run_batch_worker(
+    engine: str,
+    objects: List[str],
+    dt_values: List[float],
+    shake: bool,
+    fail_fast: int = 0,
+) -> None:
+    """Run the tests of one engine in this process (the --batch-worker side).
+
+    The test script is imported once and its main() is called for every
+    (object, dt) pair after re-parsing its flags. One result line per test is
+    written to stdout for run_engine_batch to collect. With ``fail_fast``, the
+    tests left after that many consecutive failures are reported as skipped.
+    """
+    from absl import flags
 
-        # Check for success indicators in output
-        output = result.stdout + result.stderr
-        # Check for "passed" in output OR if exit code is 0
-        success = "passed" in output.lower() or (
-            result.returncode == 0 and "failed" not in output.lower()
-        )
+    config = get_engine_config(engine)
+    script_path = Path(config["script"])
+    sys.path.insert(0, str(script_path.parent))
+    module = importlib.import_module(script_path.stem)
 
-        return success, output
-    except subprocess.TimeoutExpired as e:
-        # Get partial output
-        output = e.stdout.decode() if e.stdout else ""
-        output += e.stderr.decode() if e.stderr else ""
-        output += "\n[TIMEOUT] Test timed out after 60 seconds"
-        return False, output
-    except Exception as e:
-        return False, f"Error running test: {e}"
+    failures = 0
+    for obj in objects:
+        for dt in dt_values:
+            if fail_fast and failures >= fail_fast:
+                _, output, status = skipped_outcome(fail_fast)
+                record = {
+                    "object": obj,
+                    "dt": dt,
+                    "success": False,
+                    "output": output,
+                    "status": status,
+                }
+                print(BATCH_RESULT_PREFIX + json.dumps(record), flush=True)
+                continue
+            argv = [str(script_path)] + build_test_args(obj, dt, shake)
+            flags.FLAGS(argv)
+            buf = io.StringIO()
+            completed = True
+            with contextlib.redirect_stdout(buf):
+                try:
+                    module.main(argv)
+                except SystemExit as e:
+                    completed = not e.code
+                except Exception as e:
+                    completed = False
+                    print(f"Error running test: {e}")
+            output = buf.getvalue()
+            success = is_test_success(output, completed)
+            failures = 0 if success else failures + 1
+            record = {
+                "object": obj,
+                "dt": dt,
+                "success": success,
+                "output": output,
+                "status": "PASSED" if success else "FAILED",
+            }
+            print(BATCH_RESULT_PREFIX + json.dumps(record), flush=True)
+
+
+def print_test_status(
+    success: bool, output: str, status: str, verbose: bool = False
+) -> None:
+    """Print the outcome of a finished test."""
+    print(f"{status}")
+
+    if verbose and status == "FAILED":
+        # Print first few lines of error output
+        lines = output.strip().split("\n")[:5]
+        for line in lines:
+            if line.strip():
+                print(f"  {line}")
 
 
 def run_all_tests(
@@ -199,53 +516,105 @@ def run_all_tests(
     dt_values: List[float],
     shake: bool,
     verbose: bool = False,
-    parallel: bool = False,
+    parallel: int = 0,
+    batch: bool = False,
+    fail_fast: int = 0,
 ) -> Dict[str, Dict]:
     """Run all test combinations and collect results.
 
+    With ``batch``, the tests of each engine run in one subprocess
+    (run_engine_batch); otherwise every test runs in its own subprocess. With
+    ``parallel`` > 1, up to that many of these subprocesses run at a time.
+    Tests are reported as they finish. With ``fail_fast``, a test is skipped
+    when the ``fail_fast`` tests of its engine before it, in test matrix order,
+    all failed or were skipped. That is exact when tests run one at a time;
+    with ``parallel``, a test whose predecessors are still running is started
+    anyway, so the threshold is best-effort.
+
     Returns:
-        Dict mapping test_key to {success, output, engine, object, dt, shake}
+        Dict mapping test_key to
+        {success, output, status, engine, object, dt, shake}
     """
-    results = {}
-    total_tests = len(engines) * len(objects) * len(dt_values)
+    tasks = [
+        (test_key(engine, obj, dt), engine, obj, dt)
+        for engine in engines
+        for obj in objects
+        for dt in dt_values
+    ]
+    # (engine, position among the engine's tests in matrix order) per test
+    positions = {}
+    counts = dict.fromkeys(engines, 0)
+    for key, engine, _, _ in tasks:
+        positions[key] = (engine, counts[engine])
+        counts[engine] += 1
+    # {position: passed} of the finished tests per engine, skipped ones failed
+    finished = {engine: {} for engine in engines}
+
+    def tripped(engine: str, position: int) -> bool:
+        """Whether the fail_fast tests before this one all failed."""
+        done = finished[engine]
+        return position >= fail_fast and all(
+            done.get(i) is False for i in range(position - fail_fast, position)
+        )
+
+    # Each job returns {test_key: (success, output, status)} for its tests
+    if batch:
+        # A batch worker applies --fail-fast itself
+        jobs = [
+            functools.partial(
+                run_engine_batch, engine, objects, dt_values, shake, verbose, fail_fast
+            )
+            for engine in engines
+        ]
+    else:
+
+        def single(key: str, engine: str, obj: str, dt: float):
+            if fail_fast and tripped(*positions[key]):
+                return {key: skipped_outcome(fail_fast)}
+            return {key: run_single_test(engine, obj, dt, shake, verbose)}
+
+        jobs = [functools.partial(single, *task) for task in tasks]
+    outcomes = {}
+    total_tests = len(tasks)
     completed = 0
 
     print(f"\n{'=' * 70}")
     print(f"Running {total_tests} grasp benchmark tests")
     print(f"{'=' * 70}\n")
 
-    for engine in engines:
-        for obj in objects:
-            for dt in dt_values:
-                test_key = f"{engine}_{obj}_dt{dt:.3f}"
-                completed += 1
-
-                print(f"[{completed}/{total_tests}] {test_key}...", end=" ", flush=True)
-
-                success, output = run_single_test(engine, obj, dt, shake, verbose)
-
-                # Check if test timed out
-                if "TIMEOUT" in output:
-                    status = "TIMEOUT"
-                else:
-                    status = "PASSED" if success else "FAILED"
-                print(f"{status}")
-
-                if not success and verbose and "TIMEOUT" not in output:
-                    # Print first few lines of error output
-                    lines = output.strip().split("\n")[:5]
-                    for line in lines:
-                        if line.strip():
-                            print(f"  {line}")
-
-                results[test_key] = {
-                    "success": success,
-                    "output": output,
-                    "engine": engine,
-                    "object": obj,
-                    "dt": dt,
-                    "shake": shake,
-                }
+    def report(job_outcomes: Dict[str, Outcome]) -> None:
+        nonlocal completed
+        for key, outcome in job_outcomes.items():
+            completed += 1
+            print(f"[{completed}/{total_tests}] {key}...", end=" ")
+            print_test_status(*outcome, verbose)
+            engine, position = positions[key]
+            finished[engine][position] = outcome[0]
+        outcomes.update(job_outcomes)
+
+    if parallel > 1:
+        # The workers only wait on their test subprocess, so threads suffice
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            futures = [executor.submit(job) for job in jobs]
+            for future in as_completed(futures):
+                report(future.result())
+    else:
+        for job in jobs:
+            report(job())
+
+    # Results are keyed in test matrix order, whatever the completion order
+    results = {}
+    for key, engine, obj, dt in tasks:
+        success, output, status = outcomes[key]
+        results[key] = {
+            "success": success,
+            "output": output,
+            "status": status,
+            "engine": engine,
+            "object": obj,
+            "dt": dt,
+            "shake": shake,
+        }
 
     print(f"\n{'=' * 70}")
     print(f"Completed {completed} tests")
@@ -257,9 +626,27 @@ def run_all_tests(
 def print_summary(results: Dict[str, Dict]):
     """Print summary statistics."""
     total = len(results)
-    passed = sum(1 for r in results.values() if r["success"])
-    timed_out = sum(1 for r in results.values() if "TIMEOUT" in r.get("output", ""))
-    failed = total - passed - timed_out
+    passed = 0
+    timed_out = 0
+    skipped = 0
+    # [total, passed] per engine, object and dt, gathered in one pass
+    by_engine, by_object, by_dt = {}, {}, {}
+    for r in results.values():
+        if r["success"]:
+            passed += 1
+        elif r["status"] == "TIMEOUT":
+            timed_out += 1
+        elif r["status"] == "SKIPPED":
+            skipped += 1
+        for buckets, value in (
+            (by_engine, r["engine"]),
+            (by_object, r["object"]),
+            (by_dt, r["dt"]),
+        ):
+            bucket = buckets.setdefault(value, [0, 0])
+            bucket[0] += 1
+            bucket[1] += r["success"]
+    failed = total - passed - timed_out - skipped
 
     print(f"Summary:")
     print(f"  Total:    {total}")
@@ -269,36 +656,29 @@ def print_summary(results: Dict[str, Dict]):
         print(f"  Timed out: {timed_out} ({timed_out * 100 // total if total else 0}%)")
         print(f"\n  Note: Some tests timed out - this may indicate a bug in the engine")
         print(f"        for specific object types. See verbose output for details.")
+    if skipped > 0:
+        print(f"  Skipped:  {skipped} ({skipped * 100 // total}%)")
 
-    # Group by engine
+    # Group by engine (in test order)
     print(f"\nBy Engine:")
-    for engine in set(r["engine"] for r in results.values()):
-        engine_results = [r for r in results.values() if r["engine"] == engine]
-        engine_passed = sum(1 for r in engine_results if r["success"])
+    for engine, (engine_total, engine_passed) in by_engine.items():
         print(
-            f"  {engine:12s}: {engine_passed}/{len(engine_results)} "
-            f"({engine_passed * 100 // len(engine_results) if engine_results else 0}%)"
+            f"  {engine:12s}: {engine_passed}/{engine_total} "
+            f"({engine_passed * 100 // engine_total}%)"
         )
 
     # Group by object
     print(f"\nBy Object:")
-    for obj in sorted(set(r["object"] for r in results.values())):
-        obj_results = [r for r in results.values() if r["object"] == obj]
-        obj_passed = sum(1 for r in obj_results if r["success"])
+    for obj, (obj_total, obj_passed) in sorted(by_object.items()):
         print(
-            f"  {obj:8s}: {obj_passed}/{len(obj_results)} "
-            f"({obj_passed * 100 // len(obj_results) if obj_results else 0}%)"
+            f"  {obj:8s}: {obj_passed}/{obj_total} "
+            f"({obj_passed * 100 // obj_total}%)"
         )
 
     # Group by dt
     print(f"\nBy DT:")
-    for dt in sorted(set(r["dt"] for r in results.values())):
-        dt_results = [r for r in results.values() if r["dt"] == dt]
-        dt_passed = sum(1 for r in dt_results if r["success"])
-        print(
-            f"  {dt:.3f}: {dt_passed}/{len(dt_results)} "
-            f"({dt_passed * 100 // len(dt_results) if dt_results else 0}%)"
-        )
+    for dt, (dt_total, dt_passed) in sorted(by_dt.items()):
+        print(f"  {dt:.3f}: {dt_passed}/{dt_total} ({dt_passed * 100 // dt_total}%)")
 
 
 def generate_report(output_path: str):
@@ -326,20 +706,23 @@ def main():
     dt_values = [float(dt.strip()) for dt in args.dt_values.split(",")]
     shake = args.shake and not args.no_shake
 
+    if args.batch_worker:
+        run_batch_worker(args.batch_worker, objects, dt_values, shake, args.fail_fast)
+        return
+
     # Validate engines
-    for engine in engines:
-        if engine not in DEFAULT_ENGINES:
-            print(f"Error: Unknown engine '{engine}'")
-            print(f"Available engines: {', '.join(DEFAULT_ENGINES)}")
-            sys.exit(1)
+    invalid = set(engines) - _VALID_ENGINES
+    if invalid:
+        print(f"Error: Unknown engine(s) {', '.join(sorted(invalid))}")
+        print(f"Available engines: {', '.join(DEFAULT_ENGINES)}")
+        sys.exit(1)
 
     # Validate objects
-    valid_objects = set(DEFAULT_OBJECTS)
-    for obj in objects:
-        if obj not in valid_objects:
-            print(f"Error: Unknown object '{obj}'")
-            print(f"Available objects: {', '.join(sorted(valid_objects))}")
-            sys.exit(1)
+    invalid = set(objects) - _VALID_OBJECTS
+    if invalid:
+        print(f"Error: Unknown object(s) {', '.join(sorted(invalid))}")
+        print(f"Available objects: {', '.join(sorted(_VALID_OBJECTS))}")
+        sys.exit(1)
 
     # Run all tests
     results = run_all_tests(
@@ -349,6 +732,8 @@ def main():
         shake=shake,
         verbose=args.verbose,
         parallel=args.parallel,
+        batch=args.batch,
+        fail_fast=args.fail_fast,
     )
 
     # Print summary
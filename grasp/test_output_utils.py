@@ -15,9 +15,37 @@
 
 """Shared utilities for test output across all grasp test scripts."""
 
+import functools
 import json
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Iterable, Optional, List, Dict, Tuple
+
+# orjson is optional; it only speeds up reading and writing result files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed result JSON files keyed by path, with the (mtime_ns, size) they were
+# parsed at; load_test_results() only re-reads files that changed since
+_RESULT_CACHE: Dict[str, Tuple[int, int, Dict]] = {}
+
+# Name of the file in the output directory that persists the parsed results
+# across runs, as {filename: [mtime_ns, size, data]}
+RESULT_INDEX_NAME = "_index.json"
+# Name of the append-only log in the output directory that receives every
+# saved result as one JSON line, next to its per-test JSON file
+RESULT_LOG_NAME = "results.jsonl"
+
+# Result file stem: {engine}_grasp_{task}_{object}_mjx{true|false}_dt{value}
+_RESULT_STEM_RE = re.compile(
+    r"^(?P<engine>[^_]+)_grasp_(?P<task>[^_]+)_(?P<object>[^_]+)"
+    r"_mjx(?P<mjx>true|false)_dt(?P<dt>\d+_\d+)$"
+)
 
 
 def ensure_output_directory() -> Path:
@@ -38,12 +66,78 @@ def generate_video_path(
     return str(output_dir / filename)
 
 
-def save_video(frames: List, video_path: str, fps: int = 30, quality: int = 8) -> None:
-    """Save video frames using imageio."""
-    import imageio
+class _AvVideoWriter:
+    """Minimal PyAV H.264 writer with the append_data/close interface of imageio.
 
-    print(f"save video: {video_path}, frames = {len(frames)}")
-    imageio.mimwrite(video_path, frames, fps=fps, quality=quality)
+    The stream is configured from the first frame; each frame is encoded and
+    muxed as soon as it is appended.
+    """
+
+    def __init__(self, av, video_path: str, fps: int, quality: int):
+        self._av = av
+        self._container = av.open(video_path, mode="w")
+        self._stream = self._container.add_stream("h264", rate=fps)
+        self._stream.pix_fmt = "yuv420p"
+        # Map imageio's 0-10 quality scale onto x264's CRF (lower is better)
+        self._stream.options = {"crf": str(51 - 4 * quality)}
+        self._configured = False
+
+    def append_data(self, frame) -> None:
+        if not self._configured:
+            self._stream.height, self._stream.width = frame.shape[:2]
+            self._configured = True
+        # Captures may carry an alpha channel
+        fmt = "rgba" if frame.shape[-1] == 4 else "rgb24"
+        video_frame = self._av.VideoFrame.from_ndarray(frame, format=fmt)
+        for packet in self._stream.encode(video_frame):
+            self._container.mux(packet)
+
+    def close(self) -> None:
+        if self._configured:
+            # Flush the frames still buffered in the encoder
+            for packet in self._stream.encode(None):
+                self._container.mux(packet)
+        self._container.close()
+
+
+def _open_writer(video_path: str, fps: int, quality: int):
+    """Open a PyAV writer if PyAV is installed, an imageio writer otherwise."""
+    try:
+        import av
+    except ImportError:
+        import imageio
+
+        return imageio.get_writer(video_path, fps=fps, quality=quality)
+    return _AvVideoWriter(av, video_path, fps, quality)
+
+
+def save_video(
+    frames: Iterable, video_path: str, fps: int = 30, quality: int = 8
+) -> None:
+    """Encode video frames to a file.
+
+    Frames are encoded one at a time, so ``frames`` may be a generator that
+    produces them lazily.
+    """
+    print(f"save video: {video_path}")
+    writer = _open_writer(video_path, fps, quality)
+    n_frames = 0
+    for frame in frames:
+        writer.append_data(frame)
+        n_frames += 1
+    writer.close()
+    print(f"saved {n_frames} frames")
+
+
+def open_video_writer(video_path: str, fps: int = 30, quality: int = 8):
+    """Open a video writer that encodes frames as they are appended.
+
+    Unlike collecting all frames first, frames are not kept in memory until
+    the end of the run. Call ``close()`` on the returned writer to finish the
+    file.
+    """
+    print(f"record video: {video_path}")
+    return _open_writer(video_path, fps, quality)
 
 
 def save_test_result(
@@ -57,9 +151,13 @@ def save_test_result(
     mjx: bool,
     dt: float,
 ) -> None:
-    """Save test result to JSON file matching video filename."""
-    from datetime import datetime
+    """Save test result to JSON file matching video filename.
 
+    The result is also appended to the output directory's result log, along
+    with the (mtime_ns, size) of the JSON file it was written to;
+    load_test_results() reads it instead of JSON files it has not parsed yet
+    that still have that stat.
+    """
     task = "shake" if shake else "slip"
     result = {
         "video_path": video_path,
@@ -72,14 +170,112 @@ def save_test_result(
         "dt": dt,
         "timestamp": datetime.now().isoformat(),
     }
-    json_path = str(Path(video_path).with_suffix(".json"))
-    with open(json_path, "w") as f:
-        json.dump(result, f, indent=2)
+    json_path = os.path.splitext(video_path)[0] + ".json"
+    if orjson is not None:
+        with open(json_path, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    st = os.stat(json_path)
+    _append_result_log(
+        output_dir,
+        {
+            **result,
+            "json_file": os.path.basename(json_path),
+            "json_mtime_ns": st.st_mtime_ns,
+            "json_size": st.st_size,
+        },
+    )
+
 
+def _append_result_log(output_dir: Path, record: Dict) -> None:
+    """Append a record to the result log as a single O_APPEND write.
 
+    One write per line keeps lines intact when tests running in parallel
+    append at the same time.
+    """
+    if orjson is not None:
+        line = orjson.dumps(record) + b"\n"
+    else:
+        line = (json.dumps(record) + "\n").encode()
+    fd = os.open(
+        os.path.join(output_dir, RESULT_LOG_NAME),
+        os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+        0o644,
+    )
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _loads(raw: bytes):
+    """Parse JSON bytes, with orjson if it is installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _read_result_log(output_dir: Path) -> Dict[str, Dict]:
+    """Read the result log as {json filename: latest record}.
+
+    A line that cannot be parsed (e.g. cut short by a crash) is skipped.
+    """
+    try:
+        raw = (Path(output_dir) / RESULT_LOG_NAME).read_bytes()
+    except OSError:
+        return {}
+    records = {}
+    for line in raw.splitlines():
+        try:
+            record = _loads(line)
+        except ValueError:
+            continue
+        records[record["json_file"]] = record
+    return records
+
+
+def _read_result_index(output_dir: Path) -> Dict[str, Tuple[int, int, Dict]]:
+    """Read the persisted result index; a missing or corrupt index is empty."""
+    try:
+        index = _loads((Path(output_dir) / RESULT_INDEX_NAME).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return {name: tuple(entry) for name, entry in index.items()}
+
+
+def _write_result_index(
+    output_dir: Path, index: Dict[str, Tuple[int, int, Dict]]
+) -> None:
+    """Atomically replace the persisted result index, then empty the result log.
+
+    The index holds every result file of the directory, so the log records
+    are no longer needed and the log is truncated instead of growing with
+    every run. A record appended since the directory was scanned is lost with
+    it, which only means its file gets parsed. The index and log are only
+    caches, so failing to write them (e.g. in a read-only directory) is not
+    an error.
+    """
+    index_path = os.path.join(output_dir, RESULT_INDEX_NAME)
+    tmp_path = index_path + ".tmp"
+    try:
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(index))
+        else:
+            with open(tmp_path, "w") as f:
+                json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        os.truncate(os.path.join(output_dir, RESULT_LOG_NAME), 0)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_result_filename(filename: str) -> Optional[Dict[str, any]]:
     """Extract engine, task, object, mjx, dt from filename.
 
+    Results are memoized, so callers must not modify the returned dict.
+
     Example: "mujoco_grasp_shake_cube_mjxfalse_dt0_002.json" ->
         {"engine": "mujoco", "task": "shake", "object": "cube", "mjx": False, "dt": 0.002}
 
@@ -90,24 +286,20 @@ def parse_result_filename(filename: str) -> Optional[Dict[str, any]]:
         Dict with keys: engine, task, object, mjx, dt, or None if pattern doesn't match
     """
     stem = Path(filename).stem  # Remove .json
-    parts = stem.split("_")
 
     # New pattern: {engine}_grasp_{task}_{object}_mjx{true|false}_dt{value}
-    if len(parts) >= 8 and parts[1] == "grasp":
-        try:
-            mjx_val = parts[5].replace("mjx", "") == "true"
-            dt_val = float(parts[6].replace("dt", "").replace("_", "."))
-            return {
-                "engine": parts[0],
-                "task": parts[2],
-                "object": parts[3],
-                "mjx": mjx_val,
-                "dt": dt_val,
-            }
-        except (ValueError, IndexError):
-            pass
+    match = _RESULT_STEM_RE.match(stem)
+    if match:
+        return {
+            "engine": match["engine"],
+            "task": match["task"],
+            "object": match["object"],
+            "mjx": match["mjx"] == "true",
+            "dt": float(match["dt"].replace("_", ".")),
+        }
 
     # Fallback to old pattern for backward compatibility
+    parts = stem.split("_")
     if len(parts) >= 4 and parts[1] == "grasp":
         return {
             "engine": parts[0],
@@ -123,6 +315,15 @@ def parse_result_filename(filename: str) -> Optional[Dict[str, any]]:
 def load_test_results(output_dir: Path = None) -> List[Dict]:
     """Scan output directory and load all JSON test results.
 
+    The directory is listed once; JSON files are only parsed again when their
+    mtime or size changed since the previous call, and videos stored in the
+    same directory are looked up in that listing instead of stat'ed. Parsed
+    files are also recorded in the directory's result index, so a new process
+    only parses the files that changed since the index was last written.
+    Files missing from both are taken from the directory's result log when it
+    holds their latest record and that record was written with the file's
+    current mtime and size, with one sequential read for all of them.
+
     Args:
         output_dir: Directory containing JSON files. Defaults to "output/".
 
@@ -137,17 +338,50 @@ def load_test_results(output_dir: Path = None) -> List[Dict]:
         return []
 
     results = []
-    for json_file in output_dir.glob("*.json"):
-        parsed = parse_result_filename(json_file.name)
+    with os.scandir(output_dir) as entries:
+        entries = list(entries)
+    names = {e.name for e in entries}
+    abs_output_dir = os.path.abspath(output_dir)
+    json_entries = [e for e in entries if e.name.endswith(".json") and e.is_file()]
+    index = _read_result_index(output_dir) if RESULT_INDEX_NAME in names else {}
+    new_index = {}
+    log = None
+    for entry in json_entries:
+        parsed = parse_result_filename(entry.name)
         if not parsed:
             continue
 
-        with open(json_file, "r") as f:
-            data = json.load(f)
+        json_file = Path(output_dir) / entry.name
+        st = entry.stat()
+        cached = _RESULT_CACHE.get(entry.path) or index.get(entry.name)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            data = cached[2]
+        else:
+            if log is None:
+                has_log = RESULT_LOG_NAME in names
+                log = _read_result_log(output_dir) if has_log else {}
+            # A log record only stands in for the file it was written with;
+            # a file rewritten, edited or copied in since is parsed
+            record = log.get(entry.name)
+            if record and (record.get("json_mtime_ns"), record.get("json_size")) == (
+                st.st_mtime_ns,
+                st.st_size,
+            ):
+                data = record
+            else:
+                data = _loads(json_file.read_bytes())
+        _RESULT_CACHE[entry.path] = new_index[entry.name] = (
+            st.st_mtime_ns,
+            st.st_size,
+            data,
+        )
 
         # Check if video exists
-        video_path = Path(data["video_path"])
-        video_exists = video_path.exists()
+        video_dir, video_name = os.path.split(os.path.abspath(data["video_path"]))
+        if video_dir == abs_output_dir:
+            video_exists = video_name in names
+        else:
+            video_exists = Path(data["video_path"]).exists()
 
         # Use values from JSON if available (new format), otherwise use parsed values
         mjx = data.get("mjx", parsed.get("mjx", False))
@@ -166,9 +400,23 @@ def load_test_results(output_dir: Path = None) -> List[Dict]:
             }
         )
 
+    if new_index != index:
+        _write_result_index(output_dir, new_index)
+
     return results
 
 
+@functools.lru_cache(maxsize=64)
+def _dt_key(dt: float) -> str:
+    """Format a dt value with 3 decimal places, as used for the by_dt stats."""
+    return f"{dt:.3f}"
+
+
+def success_level(rate: float) -> str:
+    """Classify a success rate in percent as "high", "medium" or "low"."""
+    return "high" if rate >= 75 else "medium" if rate >= 50 else "low"
+
+
 def generate_summary_stats(results: List[Dict]) -> Dict:
     """Calculate success/failure statistics by engine/object/task/mjx/dt.
 
@@ -176,12 +424,14 @@ def generate_summary_stats(results: List[Dict]) -> Dict:
         results: List of test result dicts from load_test_results()
 
     Returns:
-        Dict with total, success, failure counts and breakdowns by category
+        Dict with total, success, failure counts and breakdowns by category.
+        Each breakdown bucket also holds its success "rate" in percent and
+        the success_level() of that rate.
     """
     stats = {
         "total": len(results),
-        "success": sum(1 for r in results if r["status"] == "success"),
-        "failure": sum(1 for r in results if r["status"] == "failure"),
+        "success": 0,
+        "failure": 0,
         "by_engine": {},
         "by_object": {},
         "by_task": {},
@@ -189,22 +439,33 @@ def generate_summary_stats(results: List[Dict]) -> Dict:
         "by_dt": {},  # NEW
     }
 
-    for key in ["engine", "object", "task", "mjx", "dt"]:
-        for result in results:
-            value = result[key]
+    # One pass over the results updates every category
+    for result in results:
+        status = result["status"]
+        if status in ("success", "failure"):
+            stats[status] += 1
+        outcome = "success" if status == "success" else "failure"
+        categories = (
+            ("by_engine", result["engine"]),
+            ("by_object", result["object"]),
+            ("by_task", result["task"]),
             # Convert boolean to string for mjx
-            if key == "mjx":
-                value = str(value).lower()
+            ("by_mjx", str(result["mjx"]).lower()),
             # Format dt to string with 3 decimal places
-            elif key == "dt":
-                value = f"{value:.3f}"
-            if value not in stats[f"by_{key}"]:
-                stats[f"by_{key}"][value] = {"total": 0, "success": 0, "failure": 0}
-            stats[f"by_{key}"][value]["total"] += 1
-            if result["status"] == "success":
-                stats[f"by_{key}"][value]["success"] += 1
-            else:
-                stats[f"by_{key}"][value]["failure"] += 1
+            ("by_dt", _dt_key(result["dt"])),
+        )
+        for category, value in categories:
+            bucket = stats[category].setdefault(
+                value, {"total": 0, "success": 0, "failure": 0}
+            )
+            bucket["total"] += 1
+            bucket[outcome] += 1
+
+    # Derived once here instead of by every report section that shows them
+    for category in ("by_engine", "by_object", "by_task", "by_mjx", "by_dt"):
+        for bucket in stats[category].values():
+            bucket["rate"] = (bucket["success"] / bucket["total"]) * 100
+            bucket["level"] = success_level(bucket["rate"])
 
     return stats
 
@@ -226,19 +487,28 @@ def group_results_by_object_and_dt(results: List[Dict]) -> Dict[str, Dict[float,
             ...
         }
     """
-    grouped = {}
-    for result in results:
-        obj = result["object"]
-        dt = result["dt"]
+    return group_results_with_counts(results)[0]
+
+
+def group_results_with_counts(
+    results: List[Dict],
+) -> Tuple[Dict[str, Dict[float, List[Dict]]], Dict[str, int]]:
+    """Group results like group_results_by_object_and_dt(), counting them too.
 
-        if obj not in grouped:
-            grouped[obj] = {}
-        if dt not in grouped[obj]:
-            grouped[obj][dt] = []
+    Args:
+        results: List of test result dicts from load_test_results()
 
-        grouped[obj][dt].append(result)
+    Returns:
+        Tuple of the grouped results and the number of results per object,
+        both collected in the same pass
+    """
+    grouped = defaultdict(lambda: defaultdict(list))
+    counts = Counter()
+    for result in results:
+        grouped[result["object"]][result["dt"]].append(result)
+        counts[result["object"]] += 1
 
-    return grouped
+    return {obj: dict(dt_groups) for obj, dt_groups in grouped.items()}, counts
 
 
 def get_config_combinations(results: List[Dict]) -> List[tuple]:
@@ -250,8 +520,5 @@ def get_config_combinations(results: List[Dict]) -> List[tuple]:
     Returns:
         Sorted list of tuples: [('ball', 0.002), ('ball', 0.01), ('cube', 0.002), ...]
     """
-    # Get unique combinations
-    combinations = set((r["object"], r["dt"]) for r in results)
-
-    # Sort by object name, then by dt value
-    return sorted(combinations, key=lambda x: (x[0], x[1]))
+    # Unique combinations, sorted by object name, then by dt value
+    return sorted({(r["object"], r["dt"]) for r in results})
@@ -15,63 +15,238 @@
 
 """Generate HTML visualization of grasp test results."""
 
+import functools
+import gzip
+import hashlib
+import html
+import itertools
+import json
+import os
+import re
 from pathlib import Path
-from typing import List, Dict
-from test_output_utils import load_test_results, generate_summary_stats
+from typing import Callable, List, Dict, Tuple
+from test_output_utils import (
+    RESULT_INDEX_NAME,
+    generate_summary_stats,
+    group_results_with_counts,
+    load_test_results,
+)
 
+# brotli is optional; without it only the gzip copy of the report is written
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-def _make_relative_to_html(video_path: str, html_output_path: str) -> str:
-    """Convert video path to be relative to HTML file location.
+
+@functools.lru_cache(maxsize=8)
+def _resolve_html_dir(html_output_path: str) -> str:
+    """Return the resolved directory of the HTML file, resolved once per path."""
+    return os.path.realpath(os.path.dirname(html_output_path))
+
+
+@functools.lru_cache(maxsize=64)
+def _format_dt(dt: float) -> str:
+    """Format a dt value with 3 decimal places, stripping trailing zeros."""
+    return f"{dt:.3f}".rstrip("0").rstrip(".")
+
+
+@functools.lru_cache(maxsize=256)
+def _display_name(name: str) -> str:
+    """Return the capitalized engine or object name shown in the report."""
+    return name.capitalize()
+
+
+@functools.lru_cache(maxsize=256)
+def _html_name(name: str) -> str:
+    """Return the display name of an engine or object, escaped for HTML."""
+    return html.escape(_display_name(name))
+
+
+@functools.lru_cache(maxsize=4096)
+def _make_relative_to_html(video_path: str, html_dir: str) -> str:
+    """Convert video path to be relative to HTML file location, once per path.
 
     Args:
         video_path: Original video path (e.g., "output/motrix_grasp_shake_cube.mp4")
-        html_output_path: Path where HTML will be saved (e.g., "output/test_results.html")
+        html_dir: Resolved directory of the HTML file, from _resolve_html_dir()
 
     Returns:
         Relative path from HTML to video (e.g., "motrix_grasp_shake_cube.mp4")
     """
-    video = Path(video_path)
-    html_dir = Path(html_output_path).parent
+    prefix = html_dir.rstrip(os.sep) + os.sep
+    # The lexical absolute path usually already lies in the HTML directory;
+    # symlinks are only resolved (with filesystem calls) when it does not
+    for video in (os.path.abspath(video_path), os.path.realpath(video_path)):
+        if video.startswith(prefix):
+            return video[len(prefix) :]
+    # If can't make relative, return as-is
+    return video_path
+
+
+def _index_results(results: List[Dict]) -> Dict[str, Dict[Tuple[str, float], Dict]]:
+    """Map engine, then (object, dt), to its result; later results win on duplicates."""
+    lookup = {}
+    for r in results:
+        lookup.setdefault(r["engine"], {})[r["object"], r["dt"]] = r
+    return lookup
+
 
-    try:
-        # Make path relative to HTML directory
-        relative = video.resolve().relative_to(html_dir.resolve())
-        return str(relative)
-    except ValueError:
-        # If can't make relative, use absolute path or return as-is
-        return str(video)
+def _result_axes(
+    results: List[Dict],
+) -> Tuple[List[str], List[str], List[float]]:
+    """Return the sorted unique engines, objects and dt values in one pass."""
+    engines, objects, dt_values = set(), set(), set()
+    for r in results:
+        engines.add(r["engine"])
+        objects.add(r["object"])
+        dt_values.add(r["dt"])
+    return sorted(engines), sorted(objects), sorted(dt_values)
+
+
+def _write_compressed_copies(path: Path) -> None:
+    """Write pre-encoded .gz (and .br, if brotli is installed) copies of a file.
+
+    Static file servers can then send the encoded copy as is instead of
+    compressing the report on every request.
+    """
+    data = path.read_bytes()
+    # mtime=0 keeps the .gz identical for identical reports
+    Path(f"{path}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        Path(f"{path}.br").write_bytes(brotli.compress(data, quality=11))
+
+
+def _matrix_columns(
+    objects: List[str],
+    dt_values: List[float],
+    result_lookup: Dict[str, Dict[Tuple[str, float], Dict]],
+) -> List[Tuple[str, float]]:
+    """Return the (object, dt) matrix columns that have at least one result.
+
+    Columns are ordered by object, then dt; combinations that no engine was
+    tested with are left out instead of rendered as a column of empty cells.
+    """
+    seen_pairs = {pair for by_engine in result_lookup.values() for pair in by_engine}
+    return [
+        (obj, dt) for obj in objects for dt in dt_values if (obj, dt) in seen_pairs
+    ]
+
+
+def _report_options(title: str, compress: bool) -> Tuple:
+    """Return the report options plus the stat of this module's own file.
+
+    Part of both report fingerprints, so that a change to the report code
+    invalidates old reports as well.
+    """
+    st = os.stat(__file__)
+    return title, compress, st.st_mtime_ns, st.st_size
+
+
+def _report_fingerprint(results_dir: Path, options: Tuple) -> str:
+    """Hash the files a report is generated from, without reading them.
+
+    That is the (name, mtime_ns, size) of the result JSON files and videos in
+    ``results_dir``, along with the report options from _report_options().
+    """
+    inputs = []
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if (
+                entry.name.endswith((".json", ".mp4"))
+                and entry.name != RESULT_INDEX_NAME
+            ):
+                st = entry.stat()
+                inputs.append((entry.name, st.st_mtime_ns, st.st_size))
+    key = (sorted(inputs), os.path.abspath(results_dir), options)
+    return hashlib.blake2b(repr(key).encode()).hexdigest()
+
+
+def _results_digest(results: List[Dict], options: Tuple) -> str:
+    """Hash the loaded results a report is rendered from.
+
+    Unlike _report_fingerprint(), this still matches when tests were run again
+    with the same outcomes, which rewrites their files but not the report.
+    """
+    data = json.dumps(results, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{data}{options!r}".encode(), digest_size=16).hexdigest()
 
 
 def generate_html_report(
     output_path: str = "output/test_results.html",
     results_dir: Path = None,
     title: str = "Grasp Test Results",
+    compress: bool = True,
+    force: bool = False,
 ) -> None:
     """Generate self-contained HTML report with embedded videos.
 
+    Fingerprints of the input files and of the loaded results are stored next
+    to the report (``.fp``). When the files are unchanged the results are not
+    even loaded; when only the results are unchanged the existing report is
+    kept as well.
+
     Args:
         output_path: Path where HTML file will be saved
         results_dir: Directory containing JSON results (defaults to "output/")
         title: Title for the HTML page
+        compress: Also write pre-compressed copies next to the HTML file
+        force: Regenerate the report even if its inputs are unchanged
     """
+    if results_dir is None:
+        results_dir = Path("output")
+    output_file = Path(output_path)
+    fingerprint_file = output_file.with_name(output_file.name + ".fp")
+    options = _report_options(title, compress)
+    # (input fingerprint, results digest) the existing report was made from
+    previous = ("", "")
+    if not force and output_file.exists() and fingerprint_file.exists():
+        previous = tuple(fingerprint_file.read_text().split("\n", 1))
+    fingerprint = ""
+    if Path(results_dir).exists():
+        fingerprint = _report_fingerprint(results_dir, options)
+        if fingerprint == previous[0]:
+            print(f"✅ Report up to date: {output_path}")
+            return
+
     results = load_test_results(results_dir)
+    digest = _results_digest(results, options)
+    if digest == previous[-1]:
+        fingerprint_file.write_text(f"{fingerprint}\n{digest}")
+        print(f"✅ Report up to date: {output_path}")
+        return
     stats = generate_summary_stats(results)
 
-    html = _create_html_template(title, results, stats, output_path)
-
-    output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html)
+    # Sections are written as they are generated; the previous report is only
+    # replaced once the new one is complete
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+        _write_html_template(f.write, title, results, stats, output_path)
+    os.replace(tmp_file, output_file)
+    if compress:
+        _write_compressed_copies(output_file)
+    fingerprint_file.write_text(f"{fingerprint}\n{digest}")
 
     print(f"✅ Report generated: {output_path}")
 
 
-def _create_html_template(
-    title: str, results: List[Dict], stats: Dict, html_output_path: str
-) -> str:
-    """Generate HTML string with embedded videos and new grouped layout."""
-    return f"""<!DOCTYPE html>
+def _write_html_template(
+    write: Callable[[str], object],
+    title: str,
+    results: List[Dict],
+    stats: Dict,
+    html_output_path: str,
+) -> None:
+    """Pass the HTML document to ``write`` section by section.
+
+    The detailed results, which make up most of the document, are written
+    fragment by fragment, so the whole document is never held in memory.
+    """
+    axes = _result_axes(results)
+    result_lookup = _index_results(results)
+    title = html.escape(title)
+    write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -85,22 +260,25 @@ def _create_html_template(
     </header>
 
     <nav class="quick-nav">
-        {_get_quick_nav_tabs(results)}
+        {_get_quick_nav_tabs(axes[1])}
     </nav>
 
     <main>
-        {_get_engine_overview_html(stats, results)}
-        {_get_detailed_results_by_object_html(results, html_output_path)}
+        {_get_engine_overview_html(stats, axes, result_lookup)}
+        """)
+    _write_detailed_results_by_object_html(write, results, axes[1], html_output_path)
+    write(f"""
     </main>
 
+    {_ENGINE_CARD_TEMPLATE}
+
     {_get_javascript()}
 </body>
-</html>"""
+</html>""")
 
 
-def _get_css_styles() -> str:
-    """Return inline CSS styles."""
-    return """<style>
+# Stylesheet of the report, minified once at import into _CSS_MIN
+_CSS = """
         :root {
             --success: #22c55e;
             --failure: #ef4444;
@@ -493,335 +671,58 @@ def _get_css_styles() -> str:
                 padding: 1rem;
             }
         }
-    </style>"""
-
-
-def _get_summary_dashboard_html(stats: Dict, results: List[Dict]) -> str:
-    """Generate summary dashboard with key insights."""
-    total = stats["total"]
-    if total == 0:
-        return ""
-
-    success_rate = (stats["success"] / total) * 100
-
-    # Find best performing engine
-    best_engine = None
-    best_engine_rate = 0
-    for engine, engine_stats in stats["by_engine"].items():
-        rate = (engine_stats["success"] / engine_stats["total"]) * 100
-        if rate > best_engine_rate:
-            best_engine_rate = rate
-            best_engine = engine
-
-    # Find most reliable object
-    best_object = None
-    best_object_rate = 0
-    for obj, obj_stats in stats["by_object"].items():
-        rate = (obj_stats["success"] / obj_stats["total"]) * 100
-        if rate > best_object_rate:
-            best_object_rate = rate
-            best_object = obj
-
-    # Effect of dt on success rate
-    dt_effect = []
-    for dt_val, dt_stats in sorted(stats["by_dt"].items(), key=lambda x: float(x[0])):
-        rate = (dt_stats["success"] / dt_stats["total"]) * 100 if dt_stats["total"] > 0 else 0
-        dt_effect.append(f"{dt_val}s: {rate:.0f}%")
-
-    return f"""
-    <div class="summary-dashboard">
-        <div class="dashboard-card">
-            <div class="label">Overall Success Rate</div>
-            <div class="value">{success_rate:.1f}%</div>
-        </div>
-        <div class="dashboard-card highlight">
-            <div class="label">Best Engine</div>
-            <div class="value">{best_engine or 'N/A'}</div>
-        </div>
-        <div class="dashboard-card">
-            <div class="label">Most Reliable Object</div>
-            <div class="value">{(best_object or 'N/A').capitalize()}</div>
-        </div>
-        <div class="dashboard-card">
-            <div class="label">DT Comparison</div>
-            <div class="value" style="font-size: 1rem;">{" vs ".join(dt_effect)}</div>
-        </div>
-    </div>"""
-
-
-def _get_success_rate_by_dimension_html(stats: Dict) -> str:
-    """Generate success rate comparison bars for each dimension."""
-    html = '<div class="success-rate-section">'
-
-    # Success rate by engine
-    if stats["by_engine"]:
-        html += '<div class="success-rate-group">'
-        html += '<div class="success-rate-title">Success Rate by Engine</div>'
-        for engine, engine_stats in sorted(stats["by_engine"].items()):
-            rate = (engine_stats["success"] / engine_stats["total"]) * 100 if engine_stats["total"] > 0 else 0
-            level = "high" if rate >= 75 else "medium" if rate >= 50 else "low"
-            html += f'''
-                <div class="success-rate-bar-container">
-                    <div class="success-rate-label">{engine.capitalize()}</div>
-                    <div class="success-rate-bar">
-                        <div class="success-rate-fill {level}" style="width: {rate}%">
-                            {rate:.0f}%
-                        </div>
-                    </div>
-                    <div class="success-rate-text">{engine_stats["success"]}/{engine_stats["total"]}</div>
-                </div>'''
-        html += '</div>'
-
-    # Success rate by object
-    if stats["by_object"]:
-        html += '<div class="success-rate-group">'
-        html += '<div class="success-rate-title">Success Rate by Object</div>'
-        for obj, obj_stats in sorted(stats["by_object"].items()):
-            rate = (obj_stats["success"] / obj_stats["total"]) * 100 if obj_stats["total"] > 0 else 0
-            level = "high" if rate >= 75 else "medium" if rate >= 50 else "low"
-            html += f'''
-                <div class="success-rate-bar-container">
-                    <div class="success-rate-label">{obj.capitalize()}</div>
-                    <div class="success-rate-bar">
-                        <div class="success-rate-fill {level}" style="width: {rate}%">
-                            {rate:.0f}%
-                        </div>
-                    </div>
-                    <div class="success-rate-text">{obj_stats["success"]}/{obj_stats["total"]}</div>
-                </div>'''
-        html += '</div>'
-
-    # Success rate by dt
-    if stats["by_dt"]:
-        html += '<div class="success-rate-group">'
-        html += '<div class="success-rate-title">Success Rate by Time Step (dt)</div>'
-        for dt_val, dt_stats in sorted(stats["by_dt"].items(), key=lambda x: float(x[0])):
-            rate = (dt_stats["success"] / dt_stats["total"]) * 100 if dt_stats["total"] > 0 else 0
-            level = "high" if rate >= 75 else "medium" if rate >= 50 else "low"
-            html += f'''
-                <div class="success-rate-bar-container">
-                    <div class="success-rate-label">{dt_val}s</div>
-                    <div class="success-rate-bar">
-                        <div class="success-rate-fill {level}" style="width: {rate}%">
-                            {rate:.0f}%
-                        </div>
-                    </div>
-                    <div class="success-rate-text">{dt_stats["success"]}/{dt_stats["total"]}</div>
-                </div>'''
-        html += '</div>'
-
-    html += '</div>'
-    return html
-
-
-def _get_comparison_matrix_html(results: List[Dict]) -> str:
-    """Generate pivot table matrix with engines vs (object, dt)."""
-    # Get unique values
-    engines = sorted(set(r["engine"] for r in results))
-    objects = sorted(set(r["object"] for r in results))
-    dt_values = sorted(set(r["dt"] for r in results))
-
-    if not engines or not objects:
-        return ""
-
-    # Create column headers: (object, dt) pairs
-    columns = [(obj, dt) for obj in objects for dt in dt_values]
-    col_count = len(columns)
-
-    html = f'''
-    <div class="comparison-matrix-section">
-        <div class="comparison-table-header">Engine vs Configuration Matrix</div>
-        <div class="comparison-matrix" style="--var-col-count: {col_count};">
-            <div class="matrix-header">
-                <div class="matrix-cell matrix-engine-label">Engine</div>'''
-
-    # Header row
-    for obj, dt in columns:
-        dt_str = f"{dt:.3f}".rstrip("0").rstrip(".") if "." in f"{dt:.3f}" else f"{dt:.3f}"
-        html += f'''
-                <div class="matrix-cell matrix-header-cell">
-                    <span>{obj.capitalize()}</span>
-                    <span style="font-weight: 400; color: #64748b;">dt={dt_str}</span>
-                </div>'''
-
-    html += '''
-            </div>'''
-
-    # Data rows
-    for engine in engines:
-        html += f'''
-            <div class="matrix-row">
-                <div class="matrix-cell matrix-engine-label">{engine.capitalize()}</div>'''
-
-        for obj, dt in columns:
-            # Find matching result
-            matching = [r for r in results if r["engine"] == engine and r["object"] == obj and r["dt"] == dt]
-
-            if matching:
-                result = matching[0]
-                if result["status"] == "success":
-                    icon = "✓"
-                    status_class = "success"
-                    detail = ""
-                else:
-                    icon = "✗"
-                    status_class = "failure"
-                    drop_time = result.get("drop_time")
-                    detail = f"@{drop_time:.1f}s" if drop_time else ""
-
-                html += f'''
-                <div class="matrix-cell">
-                    <div class="matrix-result {status_class}">
-                        <span class="matrix-result-icon">{icon}</span>
-                        <span>{detail}</span>
-                    </div>
-                </div>'''
-            else:
-                html += '''
-                <div class="matrix-cell">
-                    <div class="matrix-result missing">
-                        <span>—</span>
-                    </div>
-                </div>'''
-
-        html += '''
-            </div>'''
-
-    html += '''
-        </div>
-    </div>'''
+"""
 
-    return html
 
+def _minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
 
-def _get_summary_html(stats: Dict, results: List[Dict]) -> str:
-    """Generate summary statistics HTML."""
-    return f"""
-    {_get_summary_dashboard_html(stats, results)}
-    {_get_success_rate_by_dimension_html(stats)}
-    {_get_comparison_matrix_html(results)}"""
 
+_CSS_MIN = _minify_css(_CSS)
+_CSS_STYLES = f"<style>{_CSS_MIN}</style>"
 
-def _get_comparison_table_html(stats: Dict, results: List[Dict]) -> str:
-    """Generate HTML comparison table for individual test results."""
-    table_html = """
-    <div class="comparison-table-header">Comparison Data</div>
-    <div class="comparison-table-container">
-        <table class="comparison-table">
-            <thead>
-                <tr>
-                    <th>Engine</th>
-                    <th>Object</th>
-                    <th>UseMjx</th>
-                    <th>Dt</th>
-                    <th>Result</th>
-                </tr>
-            </thead>
-            <tbody>
-    """
-
-    # Sort results for consistent display
-    sorted_results = sorted(
-        results, key=lambda r: (r["engine"], r["object"], r["mjx"], r["dt"], r["task"])
-    )
-
-    for r in sorted_results:
-        mjx_display = "Yes" if r["mjx"] else "No"
-        dt_display = (
-            f"{r['dt']:.3f}".rstrip("0").rstrip(".")
-            if "." in f"{r['dt']:.3f}"
-            else f"{r['dt']:.3f}"
-        )
-        result_class = "success" if r["status"] == "success" else "failure"
-        result_text = r["status"].capitalize()
-
-        table_html += f'''
-                <tr>
-                    <td>{r["engine"]}</td>
-                    <td>{r["object"]}</td>
-                    <td>{mjx_display}</td>
-                    <td>{dt_display}</td>
-                    <td class="{result_class}">{result_text}</td>
-                </tr>
-            '''
-
-    table_html += """
-            </tbody>
-        </table>
-    </div>
-    """
-
-    return table_html
-
-
-def _get_filter_buttons(stats: Dict, category: str) -> str:
-    """Generate filter button HTML for a category."""
-    buttons = []
-    for key, values in stats[f"by_{category}"].items():
-        buttons.append(
-            f'<button class="filter-btn" data-filter="{category}:{key}">'
-            f"{key.capitalize()} ({values['total']})</button>"
-        )
-    return "\n        ".join(buttons)
-
-
-def _get_result_cards_html(results: List[Dict], html_output_path: str) -> str:
-    """Generate HTML for all result cards."""
-    if not results:
-        return '<div class="empty-state">No test results found. Run tests with --record flag.</div>'
-
-    cards = []
-    for r in results:
-        status_class = "success" if r["status"] == "success" else "failure"
-        drop_time_html = (
-            f'<div class="drop-time">Dropped at {r["drop_time"]:.2f}s</div>'
-            if r["drop_time"]
-            else ""
-        )
-
-        # Format mjx display name
-        mjx_display = "MJX" if r["mjx"] else "No MJX"
-        # Format dt display (use 3 decimal places, but strip trailing zeros)
-        dt_display = (
-            f"{r['dt']:.3f}".rstrip("0").rstrip(".")
-            if "." in f"{r['dt']:.3f}"
-            else f"{r['dt']:.3f}"
-        )
-
-        if r["video_exists"]:
-            # Use relative path from HTML to video
-            relative_video_path = _make_relative_to_html(
-                r["video_path"], html_output_path
-            )
-            video_html = f'<video controls src="{relative_video_path}"></video>'
-        else:
-            video_html = f'<div style="width:100%;aspect-ratio:4/3;background:#eee;display:flex;align-items:center;justify-content:center;color:#666;">Video not found</div>'
-
-        cards.append(f'''
-        <div class="result-card" data-engine="{r["engine"]}" data-object="{r["object"]}" data-task="{r["task"]}" data-mjx="{r["mjx"]}" data-dt="{r["dt"]}">
-            <div class="status-badge {status_class}">{r["status"].upper()}</div>
-            {video_html}
-            <div class="card-content">
-                <div class="card-title">{r["engine"].capitalize()} - {r["object"].capitalize()} - {r["task"].capitalize()}</div>
-                <div class="mjx-dt-labels">
-                    <span class="label-tag mjx-{str(r["mjx"]).lower()}">{mjx_display}</span>
-                    <span class="label-tag dt">DT: {dt_display}</span>
-                </div>
-                <div class="card-meta">
-                    <span>{r["engine"]}</span>
-                    <span>{r["object"]}</span>
-                    <span>{r["task"]}</span>
-                </div>
-                {drop_time_html}
-            </div>
-        </div>''')
-
-    return "\n".join(cards)
 
+def _get_css_styles() -> str:
+    """Return inline CSS styles."""
+    return _CSS_STYLES
+
+
+# Inline script of the report: engine card rendering, object tab navigation,
+# scroll tracking and lazy video loading
+_JAVASCRIPT = """<script>
+        // Build the engine result cards from their JSON data and the shared
+        // card template
+        const cardTemplate = document.getElementById('engine-card-template');
+        document.querySelectorAll('script.engine-cards-data').forEach(data => {
+            const cards = JSON.parse(data.textContent).map(card => {
+                const node = cardTemplate.content.firstElementChild.cloneNode(true);
+                const statusClass = card.status === 'success' ? 'success' : 'failure';
+                node.classList.add(statusClass);
+                node.querySelector('.engine-name').textContent = card.engine;
+                const badge = node.querySelector('.status-badge');
+                badge.classList.add(statusClass);
+                badge.textContent = card.status.toUpperCase();
+                if (card.video) {
+                    node.querySelector('video.engine-card-video').dataset.src = card.video;
+                    node.querySelector('div.engine-card-video').remove();
+                } else {
+                    node.querySelector('video.engine-card-video').remove();
+                }
+                const dropTime = node.querySelector('.drop-time');
+                if (card.drop) {
+                    dropTime.textContent = card.drop;
+                } else {
+                    dropTime.remove();
+                }
+                return node;
+            });
+            data.replaceWith(...cards);
+        });
 
-def _get_javascript() -> str:
-    """Return inline JavaScript for object tab navigation and scroll tracking."""
-    return """<script>
         // Object tab click navigation
         document.querySelectorAll('.object-tab').forEach(tab => {
             tab.addEventListener('click', () => {
@@ -860,244 +761,335 @@ def _get_javascript() -> str:
         document.querySelectorAll('.object-section').forEach(section => {
             observer.observe(section);
         });
+
+        // Load each video only when it comes near the viewport; videos in
+        // collapsed sections are not rendered, so they stay unloaded
+        const videoObserver = new IntersectionObserver((entries, obs) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    const video = entry.target;
+                    video.src = video.dataset.src;
+                    video.preload = 'metadata';
+                    obs.unobserve(video);
+                }
+            });
+        }, { rootMargin: '200px 0px' });
+
+        document.querySelectorAll('video[data-src]').forEach(video => {
+            videoObserver.observe(video);
+        });
     </script>"""
 
 
-def _get_engine_overview_html(stats: Dict, results: List[Dict]) -> str:
+def _get_javascript() -> str:
+    """Return inline JavaScript for cards, navigation, scrolling and video loading."""
+    return _JAVASCRIPT
+
+
+def _get_engine_overview_html(
+    stats: Dict,
+    axes: Tuple[List[str], List[str], List[float]],
+    result_lookup: Dict[str, Dict[Tuple[str, float], Dict]],
+) -> str:
     """Generate engine dimension overview with success cards and matrix table."""
     return f"""
     <section class="engine-overview-section">
         {_get_engine_success_cards_html(stats)}
-        {_get_engine_config_matrix_html(results)}
+        {_get_engine_config_matrix_html(axes, result_lookup)}
     </section>
     """
 
 
+# Success rate card of one engine: level, name, level, rate, successes, total
+_ENGINE_SUCCESS_CARD = """
+        <div class="engine-card %s-success">
+            <div class="engine-name">%s</div>
+            <div class="success-rate rate-%s">%.0f%%</div>
+            <div class="stats-detail">%d/%d tests</div>
+        </div>
+        """
+
+
 def _get_engine_success_cards_html(stats: Dict) -> str:
     """Generate horizontal cards showing each engine's success rate."""
     cards = []
 
     for engine, engine_stats in sorted(stats["by_engine"].items()):
-        total = engine_stats["total"]
-        success = engine_stats["success"]
-        rate = (success / total * 100) if total > 0 else 0
-
-        # Determine success level class
-        if rate >= 75:
-            level_class = "high-success"
-            rate_class = "rate-high"
-        elif rate >= 50:
-            level_class = "medium-success"
-            rate_class = "rate-medium"
-        else:
-            level_class = "low-success"
-            rate_class = "rate-low"
-
-        cards.append(f"""
-        <div class="engine-card {level_class}">
-            <div class="engine-name">{engine.capitalize()}</div>
-            <div class="success-rate {rate_class}">{rate:.0f}%</div>
-            <div class="stats-detail">{success}/{total} tests</div>
-        </div>
-        """)
+        level = engine_stats["level"]
+        cards.append(
+            _ENGINE_SUCCESS_CARD
+            % (
+                level,
+                _html_name(engine),
+                level,
+                engine_stats["rate"],
+                engine_stats["success"],
+                engine_stats["total"],
+            )
+        )
 
     return f'<div class="engine-cards-container">{"".join(cards)}</div>'
 
 
-def _get_engine_config_matrix_html(results: List[Dict]) -> str:
-    """Generate matrix table with engines as rows, (object, dt) as grouped columns."""
-    from test_output_utils import get_config_combinations
+# Matrix cells are prebuilt per outcome; only the drop time of a failure is
+# filled in per cell
+_MATRIX_CELL = """
+                    <td class="matrix-status-cell">
+                        <span class="status-icon {}">{}</span>
+                        {}
+                    </td>"""
+_SUCCESS_MATRIX_CELL = _MATRIX_CELL.format("success", "✓", "")
+_FAILURE_MATRIX_CELL = _MATRIX_CELL.format("failure", "✗", "")
+_format_timed_failure_cell = _MATRIX_CELL.format(
+    "failure", "✗", '<div class="drop-time">@{:.1f}s</div>'
+).format
+_EMPTY_MATRIX_CELL = """
+                    <td class="matrix-status-cell">
+                        <span class="status-icon missing">—</span>
+                    </td>"""
+
+
+def _render_matrix_cell(result: Dict) -> str:
+    """Render the matrix cell of one result: status icon and drop time."""
+    if result["status"] == "success":
+        return _SUCCESS_MATRIX_CELL
+    drop_time = result.get("drop_time")
+    return _format_timed_failure_cell(drop_time) if drop_time else _FAILURE_MATRIX_CELL
+
+
+def _get_engine_config_matrix_html(
+    axes: Tuple[List[str], List[str], List[float]],
+    result_lookup: Dict[str, Dict[Tuple[str, float], Dict]],
+) -> str:
+    """Generate matrix table with engines as rows, (object, dt) as grouped columns.
 
-    # Get unique values
-    engines = sorted(set(r["engine"] for r in results))
-    objects = sorted(set(r["object"] for r in results))
-    dt_values = sorted(set(r["dt"] for r in results))
+    Args:
+        axes: Sorted (engines, objects, dt values) from _result_axes()
+        result_lookup: Results indexed by _index_results()
+    """
+    engines, objects, dt_values = axes
 
     if not engines or not objects:
         return ""
 
-    # Create result lookup: (engine, object, dt) -> result
-    result_lookup = {}
-    for r in results:
-        result_lookup[(r["engine"], r["object"], r["dt"])] = r
-
-    html = f"""
+    parts = [f"""
     <div class="engine-matrix-wrapper">
         <div class="engine-matrix-title">Engine vs Configuration Matrix</div>
         <table class="engine-matrix-table">
             <thead>
                 <tr class="group-header">
-                    <th rowspan="2">Engine</th>"""
+                    <th rowspan="2">Engine</th>"""]
+
+    columns = _matrix_columns(objects, dt_values, result_lookup)
 
     # Header row with object grouping
     for obj in objects:
-        colspan = len(dt_values)
-        html += f"""
-                    <th colspan="{colspan}">{obj.capitalize()}</th>"""
+        colspan = sum(1 for col_obj, _ in columns if col_obj == obj)
+        if colspan:
+            parts.append(f"""
+                    <th colspan="{colspan}">{_html_name(obj)}</th>""")
 
-    html += """
+    parts.append("""
                 </tr>
-                <tr class="sub-header">"""
+                <tr class="sub-header">""")
 
     # Sub-header row with dt values for each object
-    for obj in objects:
-        for dt in dt_values:
-            dt_str = f"{dt:.3f}".rstrip("0").rstrip(".")
-            html += f"""
-                    <th>dt={dt_str}</th>"""
+    dt_strs = {dt: _format_dt(dt) for dt in dt_values}
+    for _, dt in columns:
+        parts.append(f"""
+                    <th>dt={dt_strs[dt]}</th>""")
 
-    html += """
+    parts.append("""
                 </tr>
             </thead>
-            <tbody>"""
+            <tbody>""")
 
-    # Data rows
+    # Data rows. Cells only differ by status and drop time, so each distinct
+    # pair is rendered once and shared by all cells that show it.
+    cell_cache = {}
     for engine in engines:
-        html += f"""
+        parts.append(f"""
                 <tr>
-                    <td class="engine-col-header">{engine.capitalize()}</td>"""
-
-        for obj in objects:
-            for dt in dt_values:
-                result = result_lookup.get((engine, obj, dt))
-
-                if result:
-                    if result["status"] == "success":
-                        icon = "✓"
-                        icon_class = "success"
-                        drop_time_html = ""
-                    else:
-                        icon = "✗"
-                        icon_class = "failure"
-                        drop_time = result.get("drop_time")
-                        drop_time_html = f'<div class="drop-time">@{drop_time:.1f}s</div>' if drop_time else ""
-
-                    html += f"""
-                    <td class="matrix-status-cell">
-                        <span class="status-icon {icon_class}">{icon}</span>
-                        {drop_time_html}
-                    </td>"""
-                else:
-                    html += """
-                    <td class="matrix-status-cell">
-                        <span class="status-icon missing">—</span>
-                    </td>"""
-
-        html += """
-                </tr>"""
-
-    html += """
+                    <td class="engine-col-header">{_html_name(engine)}</td>""")
+
+        cells = {}
+        for pair, result in result_lookup[engine].items():
+            cell_key = (result["status"], result.get("drop_time"))
+            cell = cell_cache.get(cell_key)
+            if cell is None:
+                cell = cell_cache[cell_key] = _render_matrix_cell(result)
+            cells[pair] = cell
+        # The column tuples double as keys, no key is built per cell
+        for column in columns:
+            parts.append(cells.get(column, _EMPTY_MATRIX_CELL))
+
+        parts.append("""
+                </tr>""")
+
+    parts.append("""
             </tbody>
         </table>
-    </div>"""
+    </div>""")
 
-    return html
+    return "".join(parts)
 
 
-def _get_detailed_results_by_object_html(results: List[Dict], html_output_path: str) -> str:
-    """Generate detailed results grouped by object (as sections) and dt (as subsections)."""
-    from test_output_utils import group_results_by_object_and_dt
+def _write_detailed_results_by_object_html(
+    write: Callable[[str], object],
+    results: List[Dict],
+    objects: List[str],
+    html_output_path: str,
+) -> None:
+    """Write detailed results grouped by object (as sections) and dt (as subsections).
 
-    grouped = group_results_by_object_and_dt(results)
+    Args:
+        write: Callable receiving the HTML fragments
+        results: List of test result dicts
+        objects: Sorted objects of the results, from _result_axes()
+        html_output_path: Path of the HTML file the video paths are relative to
+    """
+    grouped, counts = group_results_with_counts(results)
 
     if not grouped:
-        return '<div class="empty-section">No test results found</div>'
+        write('<div class="empty-section">No test results found</div>')
+        return
 
-    html = '<div class="detailed-results-section">'
+    write('<div class="detailed-results-section">')
 
-    # Sort objects alphabetically
-    for object_name in sorted(grouped.keys()):
+    for object_name in objects:
         dt_groups = grouped[object_name]
-        html += _get_object_section_html(object_name, dt_groups, html_output_path)
-
-    html += '</div>'
-
-    return html
+        _write_object_section(
+            write, object_name, dt_groups, counts[object_name], html_output_path
+        )
 
+    write('</div>')
 
-def _get_object_section_html(object_name: str, dt_groups: Dict[float, List[Dict]], html_output_path: str) -> str:
-    """Generate HTML for one object section using <details> element."""
-    # Calculate stats
-    config_count = len(dt_groups)
-    total_tests = sum(len(v) for v in dt_groups.values())
 
-    html = f"""
-    <details class="object-section" id="object-{object_name}" open>
+# Markup around the object sections and dt subsections, filled in with
+# str.format; the dt subsection is split around its embedded card data
+_OBJECT_SECTION_HEAD = """
+    <details class="object-section" id="object-{name}" open>
         <summary class="object-section-header">
-            <h2>{object_name.capitalize()}</h2>
+            <h2>{title}</h2>
             <div class="object-stats">
                 <span>Configurations: {config_count}</span>
                 <span>Total Tests: {total_tests}</span>
             </div>
         </summary>"""
+_OBJECT_SECTION_TAIL = """
+    </details>"""
+_DT_SUBSECTION_HEAD = """
+    <div class="dt-subsection">
+        <div class="dt-subsection-header">
+            Time Step: dt={dt}
+        </div>
+        <div class="engine-comparison-grid">
+            <script type="application/json" class="engine-cards-data">"""
+_DT_SUBSECTION_TAIL = """</script>
+        </div>
+    </div>
+    """
+
+
+def _write_object_section(
+    write: Callable[[str], object],
+    object_name: str,
+    dt_groups: Dict[float, List[Dict]],
+    total_tests: int,
+    html_output_path: str,
+) -> None:
+    """Write the HTML of one object section using <details> element."""
+    write(
+        _OBJECT_SECTION_HEAD.format(
+            name=html.escape(object_name),
+            title=_html_name(object_name),
+            config_count=len(dt_groups),
+            total_tests=total_tests,
+        )
+    )
 
     # Sort dt values
     for dt_value in sorted(dt_groups.keys()):
-        engine_results = dt_groups[dt_value]
-        html += _get_dt_subsection_html(dt_value, engine_results, html_output_path)
+        _write_dt_subsection(write, dt_value, dt_groups[dt_value], html_output_path)
 
-    html += """
-    </details>"""
+    write(_OBJECT_SECTION_TAIL)
 
-    return html
 
+# Markup shared by every engine result card; the page script fills in a copy
+# for each entry of the JSON data embedded in the dt subsections
+_ENGINE_CARD_TEMPLATE = """<template id="engine-card-template">
+        <div class="engine-result-card">
+            <div class="engine-card-header">
+                <span class="engine-name"></span>
+                <span class="status-badge"></span>
+            </div>
+            <video class="engine-card-video" controls preload="none"></video>
+            <div class="engine-card-video"
+                style="display:flex;align-items:center;justify-content:center;color:#666;">
+                Video not found
+            </div>
+            <div class="engine-card-meta">
+                <div class="drop-time"></div>
+            </div>
+        </div>
+    </template>"""
 
-def _get_dt_subsection_html(dt_value: float, engine_results: List[Dict], html_output_path: str) -> str:
-    """Generate HTML for one dt subsection with engine comparison grid."""
-    dt_str = f"{dt_value:.3f}".rstrip("0").rstrip(".")
 
-    html = f'''
-    <div class="dt-subsection">
-        <div class="dt-subsection-header">
-            Time Step: dt={dt_str}
-        </div>
-        <div class="engine-comparison-grid">
-    '''
+def _write_dt_subsection(
+    write: Callable[[str], object],
+    dt_value: float,
+    engine_results: List[Dict],
+    html_output_path: str,
+) -> None:
+    """Write the HTML of one dt subsection with engine comparison grid.
 
-    # Generate card for each engine
+    The engine cards are not rendered here: only their data is embedded as
+    JSON, from which the page script builds them with _ENGINE_CARD_TEMPLATE.
+    """
+    html_dir = _resolve_html_dir(html_output_path)
+    cards = []
     for result in engine_results:
-        status_class = "success" if result["status"] == "success" else "failure"
-
-        # Video path
+        # Video path, loaded by the page script once the card nears the viewport
+        video = None
         if result["video_exists"]:
-            relative_video_path = _make_relative_to_html(
-                result["video_path"], html_output_path
-            )
-            video_html = f'<video class="engine-card-video" controls src="{relative_video_path}"></video>'
-        else:
-            video_html = f'<div class="engine-card-video" style="display:flex;align-items:center;justify-content:center;color:#666;">Video not found</div>'
-
-        # Drop time
-        drop_time_html = ""
-        if result["status"] == "failure" and result.get("drop_time"):
-            drop_time_html = f'<div class="drop-time">Dropped at {result["drop_time"]:.2f}s</div>'
-
-        html += f'''
-            <div class="engine-result-card {status_class}">
-                <div class="engine-card-header">
-                    <span class="engine-name">{result["engine"].capitalize()}</span>
-                    <span class="status-badge {status_class}">{result["status"].upper()}</span>
-                </div>
-                {video_html}
-                <div class="engine-card-meta">
-                    {drop_time_html}
-                </div>
-            </div>
-        '''
+            video = _make_relative_to_html(result["video_path"], html_dir)
 
-    html += '''
-        </div>
-    </div>
-    '''
+        # Drop time, only shown for failures
+        status = result["status"]
+        drop_time = result.get("drop_time") if status == "failure" else None
+        drop = f"Dropped at {drop_time:.2f}s" if drop_time else ""
+
+        cards.append({
+            "engine": _display_name(result["engine"]),
+            "status": status,
+            "video": video,
+            "drop": drop,
+        })
+    # "</" must not appear inside a <script> element
+    cards_json = json.dumps(cards, separators=(",", ":")).replace("</", "<\\/")
 
-    return html
+    write(_DT_SUBSECTION_HEAD.format(dt=_format_dt(dt_value)))
+    write(cards_json)
+    write(_DT_SUBSECTION_TAIL)
 
 
-def _get_quick_nav_tabs(results: List[Dict]) -> str:
-    """Generate quick navigation tabs to jump to each object section."""
-    objects = sorted(set(r["object"] for r in results))
-    tabs = []
-    for i, obj in enumerate(objects):
-        active_class = "active" if i == 0 else ""
-        tabs.append(f'<button class="object-tab {active_class}" data-target="object-{obj}">{obj.capitalize()}</button>')
-    return "\n".join(tabs)
+# Quick nav tab of one object: extra class, object name, display name
+_NAV_TAB = (
+    '<button class="object-tab{}" data-target="object-{}">'
+    "{}</button>"
+)
+
+
+def _get_quick_nav_tabs(objects: List[str]) -> str:
+    """Generate quick navigation tabs to jump to each (sorted) object section."""
+    if not objects:
+        return ""
+    # Only the first tab starts out active
+    first, *rest = objects
+    tab = _NAV_TAB.format
+    return "\n".join(
+        itertools.chain(
+            [tab(" active", html.escape(first), _html_name(first))],
+            (tab("", html.escape(obj), _html_name(obj)) for obj in rest),
+        )
+    )
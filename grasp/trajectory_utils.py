@@ -0,0 +1,132 @@
+# Copyright (C) 2020-2025 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Shared control trajectory utilities for all grasp test scripts."""
+
+from typing import Optional
+
+import numpy as np
+
+# Start times (seconds) of the grasp test phases:
+# move to lift, move to grasp, close gripper, lift object, hold/shake
+PHASE_TIMES = (0.0, 1.0, 2.0, 3.0, 4.0)
+HOLD_START = PHASE_TIMES[-1]
+# The test passes once the object is still held at this time (seconds)
+TEST_DURATION = 20.0
+
+
+def phase_step(t: float, sim_dt: float) -> int:
+    """Return the index of the step at which elapsed time ``t`` is reached."""
+    return int(round(t / sim_dt))
+
+
+def build_qpos_schedule(
+    init_qpos: np.ndarray,
+    grasp_qpos: np.ndarray,
+    lift_qpos: np.ndarray,
+    sim_dt: float,
+    duration: float = TEST_DURATION,
+) -> np.ndarray:
+    """Precompute the joint position targets of the grasp test for every step.
+
+    The arm moves init -> lift -> grasp, the gripper closes, then the arm moves
+    back to lift and holds there until ``duration``. Each phase is a linspace
+    between its keyframes over an integer number of steps, so phase boundaries
+    fall on ``phase_step(t, sim_dt)`` without accumulating float error.
+
+    Args:
+        init_qpos: Initial 9-DoF configuration (7 arm joints + 2 fingers)
+        grasp_qpos: Configuration at the object, gripper open
+        lift_qpos: Lifted configuration, gripper closed
+        sim_dt: Simulation timestep
+        duration: Length of the schedule in seconds
+
+    Returns:
+        float32 array of shape (n_steps, 9) where row i is the target at
+        elapsed time i * sim_dt
+    """
+    keyframes = np.array(
+        [
+            init_qpos,
+            np.concatenate([lift_qpos[:7], grasp_qpos[7:]]),
+            grasp_qpos,
+            np.concatenate([grasp_qpos[:7], lift_qpos[7:]]),
+            lift_qpos,
+        ]
+    )
+    bounds = [phase_step(t, sim_dt) for t in PHASE_TIMES]
+
+    schedule = np.empty(
+        (phase_step(duration, sim_dt) + 1, keyframes.shape[1]), dtype=np.float32
+    )
+    for k, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        schedule[start:stop] = np.linspace(
+            keyframes[k], keyframes[k + 1], stop - start, endpoint=False
+        )
+    schedule[bounds[-1] :] = keyframes[-1]
+    return schedule
+
+
+def build_shake_noise(
+    n_steps: int, scale: float = 0.025, seed: Optional[int] = None
+) -> np.ndarray:
+    """Pre-draw the Gaussian arm perturbations of the shake phase.
+
+    Args:
+        n_steps: Number of steps to draw noise for (usually the schedule length)
+        scale: Standard deviation of the joint noise in radians
+        seed: Optional seed for reproducible shaking
+
+    Returns:
+        float32 array of shape (n_steps, 7), indexed by step like the schedule
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n_steps, 7), dtype=np.float32)
+    noise *= np.float32(scale)
+    return noise
+
+
+def apply_shake(
+    schedule: np.ndarray,
+    noise: np.ndarray,
+    start_step: int,
+    stop_step: int,
+    period: int = 2,
+) -> np.ndarray:
+    """Fold the shake perturbations into a schedule in place.
+
+    The tests pick a new perturbed arm target every ``period`` steps and hold
+    it in between, so each row of the shake window becomes its base target plus
+    the noise drawn for the last update step at or before it.
+
+    Args:
+        schedule: Table from build_qpos_schedule, modified in place
+        noise: Table from build_shake_noise
+        start_step: First step of the shake phase
+        stop_step: Step at which the shake phase ends
+        period: Number of steps between two perturbations
+
+    Returns:
+        bool array with one entry per schedule row, True at the steps where a
+        new perturbed target is picked
+    """
+    steps = np.arange(start_step, stop_step)
+    updates = steps - steps % period
+    held = updates >= start_step
+    schedule[steps[held], :7] += noise[updates[held]]
+
+    update_mask = np.zeros(len(schedule), dtype=bool)
+    update_mask[steps[steps % period == 0]] = True
+    return update_mask